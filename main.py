@@ -74,6 +74,13 @@ def cleanup_resources():
     logger = logging.getLogger(__name__)
     logger.info("正在清理资源...")
 
+    # 先停止定期检查，避免清理浏览器池期间又发起新一轮查询
+    try:
+        from src.monitor_service import stop_all_periodic_checks
+        stop_all_periodic_checks()
+    except Exception as e:
+        logger.debug(f"停止定期检查失败: {e}")
+
     try:
         from src.browser_pool import _global_pool
         if _global_pool:
@@ -86,20 +93,10 @@ def cleanup_resources():
             _global_pool.instances.clear()
             logger.info("浏览器池已清理")
 
-        # 强制杀死Chrome进程
+        # 强制杀死本程序启动的Chrome进程树（按记录的PID，不枚举全系统进程）
         try:
-            import psutil
-            killed = 0
-            for proc in psutil.process_iter(['name', 'cmdline']):
-                try:
-                    if 'chrome' in proc.info['name'].lower():
-                        # 检查是否是自动化控制的Chrome
-                        cmdline = proc.info.get('cmdline', [])
-                        if any('--remote-debugging' in str(arg) for arg in cmdline):
-                            proc.kill()
-                            killed += 1
-                except:
-                    pass
+            from src.browser_pool import kill_browser_processes
+            killed = len(kill_browser_processes())
             if killed > 0:
                 logger.info(f"已杀死 {killed} 个Chrome进程")
         except:
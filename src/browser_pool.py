@@ -9,7 +9,7 @@ import threading
 import time
 import queue
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
@@ -36,6 +36,15 @@ class BrowserInstance:
     temp_dir: Optional[str] = None  # 记录临时目录路径
     use_count: int = 0
     is_busy: bool = False
+    invalidated: bool = False  # 使用方探活失败后标记，下次取用时重建
+
+    @property
+    def service_pid(self) -> Optional[int]:
+        """chromedriver 服务进程PID，服务未启动或已退出时为 None"""
+        try:
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
 
     def is_alive(self) -> bool:
         """检查浏览器是否存活"""
@@ -45,6 +54,10 @@ class BrowserInstance:
         except:
             return False
 
+    def is_expired(self, ttl: float) -> bool:
+        """检查实例是否超过最长存活时间（ttl<=0 表示不限制）"""
+        return ttl > 0 and (datetime.now() - self.created_at).total_seconds() > ttl
+
     def cleanup(self):
         """清理浏览器实例和临时文件"""
         try:
@@ -80,12 +93,17 @@ class BrowserPool:
         self.pool_size = min(pool_size, max_pool_size)
         self.max_pool_size = max_pool_size
         self.config = config or {}
+        self.browser_ttl = self.config.get("browser_ttl", 1800)
 
         # 池管理
         self.instances: List[BrowserInstance] = []
         self.available = queue.Queue()
         self.lock = threading.Lock()
         self.shutdown = False
+        # 本池启动的 chromedriver/chrome 进程PID，退出时只清理这些进程而不枚举全系统进程
+        self.spawned_pids: Set[int] = set()
+        # 已预留名额但尚在锁外创建中的实例数，防止并发扩容超过 max_pool_size
+        self._pending_creates = 0
 
         # 性能统计
         self.stats = {
@@ -149,6 +167,7 @@ class BrowserPool:
                 service=Service(chromedriver_path),
                 options=options
             )
+            self._track_driver_pids(driver)
 
             # 设置超时
             timeout_config = self.config.get("page_load_timeout", 20)
@@ -189,6 +208,40 @@ class BrowserPool:
                     pass
             return None
 
+    def _track_driver_pids(self, driver: webdriver.Chrome):
+        """记录 chromedriver 及其启动时已派生的 Chrome 子进程PID（调用方不得持有 self.lock）"""
+        import psutil  # 仅创建浏览器与退出清理时使用，不在模块加载时导入
+
+        try:
+            pid = driver.service.process.pid
+            pids = {pid}
+            pids.update(child.pid for child in psutil.Process(pid).children(recursive=True))
+        except Exception as e:
+            self.logger.debug(f"记录浏览器进程PID失败: {e}")
+            return
+        with self.lock:
+            self.spawned_pids.update(pids)
+
+    def kill_spawned_processes(self) -> List["psutil.Process"]:
+        """结束本池启动的浏览器进程（含运行期新增的子进程），返回被结束的进程"""
+        import psutil
+
+        with self.lock:
+            root_pids = set(self.spawned_pids)
+            self.spawned_pids.clear()
+            # 创建时记录PID失败的实例，按其当前 chromedriver PID 补充
+            root_pids.update(pid for pid in (inst.service_pid for inst in self.instances) if pid)
+
+        procs: List["psutil.Process"] = []
+        for pid in root_pids:
+            try:
+                root = psutil.Process(pid)
+                procs.append(root)
+                procs.extend(root.children(recursive=True))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return _kill_browser_procs(procs)
+
     @contextmanager
     def get_browser(self, timeout: int = 30):
         """
@@ -213,11 +266,10 @@ class BrowserPool:
                     self.stats['average_wait_time'] * 0.9 + wait_time * 0.1
                 )
 
-                # 检查实例是否存活
-                if not instance.is_alive():
-                    self.logger.warning(f"浏览器实例 {instance.browser_id} 已失效，重新创建")
-                    instance.cleanup()  # 使用cleanup方法清理
-                    instance = self._create_browser_instance(instance.browser_id)
+                # 检查实例是否被标记失效、超过存活时间或已失效
+                if instance.invalidated or instance.is_expired(self.browser_ttl) or not instance.is_alive():
+                    self.logger.warning(f"浏览器实例 {instance.browser_id} 已失效或过期，重新创建")
+                    instance = self._recreate_instance(instance)
 
                 if instance:
                     instance.is_busy = True
@@ -233,20 +285,30 @@ class BrowserPool:
                     yield None
 
             except queue.Empty:
-                # 池中没有可用实例，尝试创建新的
+                # 池中没有可用实例，尝试创建新的；持锁只预留名额，创建与使用都在锁外进行
                 with self.lock:
-                    if len(self.instances) < self.max_pool_size:
-                        browser_id = f"browser_{len(self.instances)}"
-                        instance = self._create_browser_instance(browser_id)
-                        if instance:
-                            self.instances.append(instance)
-                            instance.is_busy = True
-                            instance.use_count += 1
-                            yield instance.driver
-                        else:
-                            yield None
+                    slot = len(self.instances) + self._pending_creates
+                    if slot < self.max_pool_size:
+                        self._pending_creates += 1
+                    else:
+                        slot = None
+
+                if slot is None:
+                    self.logger.warning("达到最大池大小限制，无法创建新实例")
+                    yield None
+                else:
+                    try:
+                        instance = self._create_browser_instance(f"browser_{slot}")
+                    finally:
+                        with self.lock:
+                            self._pending_creates -= 1
+                            if instance:
+                                self.instances.append(instance)
+                    if instance:
+                        instance.is_busy = True
+                        instance.use_count += 1
+                        yield instance.driver
                     else:
-                        self.logger.warning("达到最大池大小限制，无法创建新实例")
                         yield None
 
         finally:
@@ -255,6 +317,26 @@ class BrowserPool:
                 instance.is_busy = False
                 self.available.put(instance)
 
+    def _recreate_instance(self, instance: BrowserInstance) -> Optional[BrowserInstance]:
+        """清理旧实例并以相同ID重建，同步更新实例列表"""
+        instance.cleanup()  # 使用cleanup方法清理
+        new_instance = self._create_browser_instance(instance.browser_id)
+        with self.lock:
+            if instance in self.instances:
+                self.instances.remove(instance)
+            if new_instance:
+                self.instances.append(new_instance)
+        return new_instance
+
+    def invalidate(self, driver: webdriver.Chrome):
+        """标记driver对应的实例失效，归还后下次取用时重建"""
+        with self.lock:
+            for instance in self.instances:
+                if instance.driver is driver:
+                    instance.invalidated = True
+                    self.logger.warning(f"浏览器实例 {instance.browser_id} 被标记为失效")
+                    break
+
     def _reset_browser_state(self, driver: webdriver.Chrome):
         """重置浏览器状态，为下次使用做准备"""
         try:
@@ -340,6 +422,55 @@ class BrowserPool:
         self.shutdown_pool()
 
 
+def _kill_browser_procs(procs: List["psutil.Process"], seen: Optional[Set[int]] = None) -> List["psutil.Process"]:
+    """结束列表中名称为 chrome/chromedriver 的进程，返回被结束的进程"""
+    import psutil
+
+    seen = set() if seen is None else seen
+    killed: List["psutil.Process"] = []
+    for proc in procs:
+        if proc.pid in seen:
+            continue
+        seen.add(proc.pid)
+        try:
+            # PID 可能已被系统复用，仅结束名称仍为 chrome/chromedriver 的进程
+            if 'chrome' not in proc.name().lower():
+                continue
+            proc.kill()
+            killed.append(proc)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return killed
+
+
+def kill_browser_processes(wait_timeout: float = 0, sweep: bool = True) -> List[int]:
+    """结束本程序启动的浏览器进程：浏览器池记录的进程树 + 本进程的 chrome 子进程
+
+    只遍历自身派生的进程，不枚举全系统进程，也不按映像名结束用户自己打开的 Chrome；
+    sweep=False 时只处理浏览器池记录的PID，跳过子进程兜底遍历（Windows 上
+    children() 需要枚举全部进程）。wait_timeout > 0 时最多等待该秒数确认进程退出。
+    返回被结束的PID。
+    """
+    import psutil
+
+    killed: List["psutil.Process"] = []
+    pool = _global_pool
+    if pool is not None:
+        killed.extend(pool.kill_spawned_processes())
+
+    # 兜底：非浏览器池创建的浏览器（如单独的 BrowserManager）同样是本进程的子进程
+    if sweep or pool is None:
+        try:
+            children = psutil.Process().children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            children = []
+        killed.extend(_kill_browser_procs(children, seen={proc.pid for proc in killed}))
+
+    if killed and wait_timeout > 0:
+        psutil.wait_procs(killed, timeout=wait_timeout)
+    return [proc.pid for proc in killed]
+
+
 # 全局池实例（单例模式）
 _global_pool: Optional[BrowserPool] = None
 _pool_lock = threading.Lock()
@@ -36,7 +36,9 @@ class ConfigManager:
             "window_size": "1920,1080",
             "user_agent": None,
             "disable_images": True,
-            "disable_javascript": False
+            "disable_javascript": False,
+            "browser_ttl": 1800,       # 池内浏览器最长存活秒数，超过后重建
+            "max_ping_failures": 2     # 取用时连续探活失败上限
         },
         "performance": {
             "max_workers": 9,  # 增加默认工作线程
@@ -109,9 +111,12 @@ class ConfigManager:
 
     def save_config(self):
         """保存配置到文件"""
+        # 先写临时文件再替换，写入中断时不会留下截断的配置文件
+        tmp_file = self.config_file.with_suffix(".json.tmp")
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(self.config, indent=2, ensure_ascii=False))
+            tmp_file.replace(self.config_file)
             self.logger.info(f"配置已保存到: {self.config_file}")
         except Exception as e:
             self.logger.error(f"保存配置失败: {e}")
@@ -229,8 +234,11 @@ class ConfigManager:
                     line += f",{acc.api_key}"
                 lines.append(line + "\n")
 
-            with open(self.credentials_file, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
+            # 先写临时文件再替换，写入中断时不会丢失账号文件
+            tmp_file = self.credentials_file.with_suffix(".txt.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write("".join(lines))
+            tmp_file.replace(self.credentials_file)
 
             self.logger.info(f"账号已保存到: {self.credentials_file}")
         except Exception as e:
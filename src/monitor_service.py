@@ -4,29 +4,64 @@
 余额监控服务 - 核心业务逻辑
 """
 
+import os
 import time
+import random
 import json
 import logging
+import weakref
 from typing import List, Dict, Tuple, Optional, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from threading import Lock
+from threading import Lock, Event, Thread
 from pathlib import Path
 
-try:
-    import psutil
-    CPU_COUNT = psutil.cpu_count()
-except ImportError:
-    import os
-    CPU_COUNT = os.cpu_count() or 4
+CPU_COUNT = os.cpu_count() or 4
 
 from src.config_manager import ConfigManager, Account
 from src.browser_manager import BrowserManager
 from src.auth_manager import AuthManager, BalanceExtractor
 from src.api_balance_client import ApiBalanceClient
 from src.browser_pool import BrowserPool, get_global_pool
-from src.performance_monitor import get_performance_monitor, OperationTimer
+try:
+    from src.performance_monitor import get_performance_monitor, OperationTimer
+except ImportError:
+    # 性能监控模块为可选组件，缺失时使用空实现，只保留计时所需的 start_time
+    class _NullPerformanceMonitor:
+        """性能监控空实现"""
+
+        def get_stats(self) -> Dict:
+            return {}
+
+        def get_system_metrics(self) -> Dict:
+            return {}
+
+        def generate_report(self) -> str:
+            return "性能监控模块未安装"
+
+    class OperationTimer:
+        """操作计时空实现"""
+
+        def __init__(self, monitor, name: str, metadata: Optional[Dict] = None):
+            self.start_time = time.time()
+
+        def __enter__(self):
+            self.start_time = time.time()
+            return self
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            return False
+
+    def get_performance_monitor() -> _NullPerformanceMonitor:
+        return _NullPerformanceMonitor()
+
+# 余额缓存、每日首查状态仅供程序自身读取，紧凑序列化（无缩进时走 json 的 C 编码路径）
+_CACHE_JSON_SEPARATORS = (",", ":")
+
+# 已启动定期检查的服务，退出清理时统一停止
+_periodic_services: "weakref.WeakSet[BalanceMonitorService]" = weakref.WeakSet()
 
 
 @dataclass
@@ -35,15 +70,32 @@ class AccountStatus:
     username: str
     balance: str = "等待"
     status: str = "待机"
-    last_check: Optional[datetime] = None
+    last_check_ts: float = 0.0
     error_count: int = 0
     is_checking: bool = False
     extra_info: Dict = field(default_factory=dict)
 
+    @property
+    def last_check(self) -> Optional[datetime]:
+        """最后检查时间（按需由时间戳转换）"""
+        if not self.last_check_ts:
+            return None
+        return datetime.fromtimestamp(self.last_check_ts)
+
 
 class BalanceMonitorService:
     """余额监控服务"""
 
+    # 网页登录重试退避参数（秒）：带抖动的指数退避，避免多线程同步重试冲击站点
+    LOGIN_BACKOFF_BASE = 0.25
+    LOGIN_BACKOFF_CAP = 8.0
+
+    # 性能统计缓存有效期（秒），避免界面高频轮询反复调用性能监控
+    PERF_STATS_TTL = 1.0
+
+    # 定期检查默认间隔（秒），配置值不为正数时使用
+    DEFAULT_QUERY_INTERVAL = 60
+
     def __init__(self, config_manager: ConfigManager):
         """初始化监控服务"""
         self.config = config_manager
@@ -53,6 +105,12 @@ class BalanceMonitorService:
         self.browser_config = self.config.get_browser_config()
         self.performance_config = self.config.get_performance_config()
 
+        # 服务生命周期内配置不变，缓存热路径参数
+        self._retry_times = self.performance_config.get("retry_times", 3)
+        self._timeout = self.performance_config.get("timeout", 90)
+        self._query_interval = self.performance_config.get("query_interval", self.DEFAULT_QUERY_INTERVAL)
+        self._max_ping_failures = max(int(self.browser_config.get("max_ping_failures", 2)), 1)
+
         # 强制使用headless模式（无感查询）
         self.browser_config["headless"] = True
 
@@ -109,6 +167,13 @@ class BalanceMonitorService:
         self.max_workers = self._get_max_workers()
         self.executor: Optional[ThreadPoolExecutor] = None
 
+        # 定期检查
+        self.check_thread: Optional[Thread] = None
+        self._stop = Event()
+
+        # 性能统计缓存: (perf_stats, system_metrics, 时间戳)
+        self._perf_cache: Tuple[Dict, Dict, float] = ({}, {}, 0.0)
+
         # 回调函数
         self.on_balance_update: Optional[Callable] = None
         self.on_status_change: Optional[Callable] = None
@@ -134,13 +199,12 @@ class BalanceMonitorService:
 
     def _load_balance_cache(self):
         """加载本地余额缓存"""
-        if not self.balance_cache_file.exists():
-            self.logger.info(f"余额缓存文件不存在，将在首次查询后创建: {self.balance_cache_file}")
-            return
-
         try:
-            with open(self.balance_cache_file, 'r', encoding='utf-8') as f:
+            with open(self.balance_cache_file, 'rb') as f:
                 data = json.load(f)
+        except FileNotFoundError:
+            self.logger.info(f"余额缓存文件不存在，将在首次查询后创建: {self.balance_cache_file}")
+            return
         except Exception as e:
             self.logger.warning(f"读取余额缓存失败: {e}")
             return
@@ -176,9 +240,9 @@ class BalanceMonitorService:
         # 启动时直接将缓存余额映射到状态，便于 UI 首屏展示
         with self.status_lock:
             for username, item in normalized.items():
-                if username not in self.account_status:
+                status = self.account_status.get(username)
+                if status is None:
                     continue
-                status = self.account_status[username]
                 status.balance = item.get("balance", "等待")
                 status.status = "缓存"
                 status.extra_info["cached_at"] = item.get("updated_at", "")
@@ -196,8 +260,9 @@ class BalanceMonitorService:
 
         tmp_file = self.balance_cache_file.with_suffix(".json.tmp")
         try:
+            data = json.dumps(payload, ensure_ascii=False, separators=_CACHE_JSON_SEPARATORS)
             with open(tmp_file, 'w', encoding='utf-8') as f:
-                json.dump(payload, f, indent=2, ensure_ascii=False)
+                f.write(data)
             tmp_file.replace(self.balance_cache_file)
         except Exception as e:
             self.logger.warning(f"写入余额缓存失败: {e}")
@@ -224,13 +289,12 @@ class BalanceMonitorService:
 
     def _load_daily_web_state(self):
         """加载每日首查网页状态"""
-        if not self.daily_web_state_file.exists():
-            self.logger.info(f"每日首查状态文件不存在，将在首次网页查询成功后创建: {self.daily_web_state_file}")
-            return
-
         try:
-            with open(self.daily_web_state_file, 'r', encoding='utf-8') as f:
+            with open(self.daily_web_state_file, 'rb') as f:
                 data = json.load(f)
+        except FileNotFoundError:
+            self.logger.info(f"每日首查状态文件不存在，将在首次网页查询成功后创建: {self.daily_web_state_file}")
+            return
         except Exception as e:
             self.logger.warning(f"读取每日首查状态失败: {e}")
             return
@@ -287,8 +351,9 @@ class BalanceMonitorService:
 
         tmp_file = self.daily_web_state_file.with_suffix(".json.tmp")
         try:
+            data = json.dumps(payload, ensure_ascii=False, separators=_CACHE_JSON_SEPARATORS)
             with open(tmp_file, 'w', encoding='utf-8') as f:
-                json.dump(payload, f, indent=2, ensure_ascii=False)
+                f.write(data)
             tmp_file.replace(self.daily_web_state_file)
         except Exception as e:
             self.logger.warning(f"写入每日首查状态失败: {e}")
@@ -300,8 +365,8 @@ class BalanceMonitorService:
             last_day = self.daily_web_state.get(username, "")
         should_force = last_day != today
         self.logger.debug(
-            f"账号 {username} 每日首查判断: cycle_day={today}, last_day={last_day}, "
-            f"rollover={self.daily_rollover_hour:02d}:00, force_web={should_force}"
+            "账号 %s 每日首查判断: cycle_day=%s, last_day=%s, rollover=%02d:00, force_web=%s",
+            username, today, last_day, self.daily_rollover_hour, should_force
         )
         return should_force
 
@@ -312,8 +377,8 @@ class BalanceMonitorService:
             self.daily_web_state[username] = today
             self._save_daily_web_state()
         self.logger.debug(
-            f"账号 {username} 已记录当前周期网页查询成功: cycle_day={today}, "
-            f"rollover={self.daily_rollover_hour:02d}:00"
+            "账号 %s 已记录当前周期网页查询成功: cycle_day=%s, rollover=%02d:00",
+            username, today, self.daily_rollover_hour
         )
 
     def _current_web_cycle_day(self) -> str:
@@ -323,6 +388,67 @@ class BalanceMonitorService:
             now = now - timedelta(days=1)
         return now.date().isoformat()
 
+    @staticmethod
+    def _ping_driver(driver) -> bool:
+        """快速探活：读取当前URL，会话失效时抛出异常"""
+        try:
+            _ = driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def _logged_in_session(self, account: Account):
+        """
+        获取已登录的会话（上下文管理器）
+
+        每次尝试都从池中取浏览器并先探活，失效实例标记后重新获取（不计入
+        登录重试次数）；登录失败后先归还浏览器再按带抖动的指数退避等待，
+        让其他账号在退避期间使用该实例。
+        """
+        attempts = max(int(self._retry_times), 1)
+        attempt = 0
+        ping_failures = 0
+        message = ""
+        while attempt < attempts:
+            with self.browser_pool.get_browser() as driver:
+                if not driver:
+                    raise Exception("无法获取浏览器实例")
+
+                if not self._ping_driver(driver):
+                    ping_failures += 1
+                    self.browser_pool.invalidate(driver)
+                    if ping_failures >= self._max_ping_failures:
+                        raise Exception(f"浏览器实例连续 {ping_failures} 次探活失败")
+                    self.logger.warning("账号 %s 获取到失效浏览器，重新获取", account.username)
+                    continue
+                # 探活成功即中断"连续"失败计数
+                ping_failures = 0
+
+                # 创建临时的BrowserManager包装器(为了兼容现有的AuthManager)
+                browser_mgr = BrowserManager(self.browser_config)
+                browser_mgr.driver = driver  # 直接设置driver
+
+                auth_mgr = AuthManager(browser_mgr)
+                login_result = auth_mgr.login(account.username, account.password, retry_times=1)
+                if login_result.success:
+                    yield auth_mgr
+                    return
+                message = login_result.message
+
+            attempt += 1
+            if attempt < attempts:
+                delay = random.uniform(
+                    0, min(self.LOGIN_BACKOFF_CAP, self.LOGIN_BACKOFF_BASE * 2 ** (attempt - 1))
+                )
+                self.logger.warning(
+                    "账号 %s 登录失败 (尝试 %d/%d)，%.2f秒后重试: %s",
+                    account.username, attempt, attempts, delay, message
+                )
+                time.sleep(delay)
+
+        raise Exception(f"登录失败，已重试{attempts}次: {message}")
+
     def check_single_account(self, account: Account) -> Tuple[str, str, bool]:
         """检查单个账号余额 - 使用浏览器池优化版"""
         username = account.username
@@ -331,13 +457,15 @@ class BalanceMonitorService:
         with OperationTimer(self.perf_monitor, f"查询账号_{username}",
                            {"username": username}) as metrics:
 
-            self.logger.info(f"开始检查账号: {username}")
+            self.logger.info("开始检查账号: %s", username)
 
             # 更新状态
+            # 本次查询只查找一次状态对象，后续直接引用
             with self.status_lock:
-                if username in self.account_status:
-                    self.account_status[username].is_checking = True
-                    self.account_status[username].status = "查询中"
+                status = self.account_status.get(username)
+                if status is not None:
+                    status.is_checking = True
+                    status.status = "查询中"
 
             # 触发状态变更回调
             if self.on_status_change:
@@ -346,24 +474,23 @@ class BalanceMonitorService:
             # 每天首次查询强制走网页登录，后续才走API秒查
             force_web_today = self._should_force_web_query(username)
             if force_web_today:
-                self.logger.info(f"账号 {username} 当天首次查询，强制走网页登录流程")
+                self.logger.info("账号 %s 当天首次查询，强制走网页登录流程", username)
 
             # 非当天首次时，优先走API秒查（需要账号配置API Key）
             if (not force_web_today) and account.api_key:
-                self.logger.debug(f"账号 {username} 开始尝试 API 秒查")
+                self.logger.debug("账号 %s 开始尝试 API 秒查", username)
                 api_result = self.api_balance_client.query_balance(account.api_key)
                 if api_result.success and api_result.balance is not None:
                     fast_balance = f"${api_result.balance:.1f}"
                     self.logger.info(
-                        f"账号 {username} API秒查成功: {fast_balance} (source={api_result.source})"
+                        "账号 %s API秒查成功: %s (source=%s)", username, fast_balance, api_result.source
                     )
 
                     with self.status_lock:
-                        if username in self.account_status:
-                            status = self.account_status[username]
+                        if status is not None:
                             status.balance = fast_balance
                             status.status = "正常"
-                            status.last_check = datetime.now()
+                            status.last_check_ts = time.time()
                             status.error_count = 0
                             status.is_checking = False
                             status.extra_info["query_source"] = "api"
@@ -388,19 +515,16 @@ class BalanceMonitorService:
                     final_success = bool(cached_balance)
 
                     self.logger.warning(
-                        f"账号 {username} API秒查失败，已禁用网页回退: {api_result.message}"
+                        "账号 %s API秒查失败，已禁用网页回退: %s", username, api_result.message
                     )
                     if final_success:
-                        self.logger.info(
-                            f"账号 {username} 使用缓存余额返回: {final_balance}"
-                        )
+                        self.logger.info("账号 %s 使用缓存余额返回: %s", username, final_balance)
 
                     with self.status_lock:
-                        if username in self.account_status:
-                            status = self.account_status[username]
+                        if status is not None:
                             status.balance = final_balance
                             status.status = "正常" if final_success else "异常"
-                            status.last_check = datetime.now()
+                            status.last_check_ts = time.time()
                             status.error_count = 0 if final_success else status.error_count + 1
                             status.is_checking = False
                             status.extra_info["query_source"] = "api"
@@ -414,116 +538,99 @@ class BalanceMonitorService:
                     return username, final_balance, final_success
 
                 self.logger.debug(
-                    f"账号 {username} API秒查失败，按配置回退网页登录: {api_result.message}"
+                    "账号 %s API秒查失败，按配置回退网页登录: %s", username, api_result.message
                 )
 
             try:
-                # 从池中获取浏览器实例
-                with self.browser_pool.get_browser() as driver:
-                    if not driver:
-                        raise Exception("无法获取浏览器实例")
-
-                    # 创建临时的BrowserManager包装器(为了兼容现有的AuthManager)
-                    browser_mgr = BrowserManager(self.browser_config)
-                    browser_mgr.driver = driver  # 直接设置driver
-
-                    # 登录
-                    auth_mgr = AuthManager(browser_mgr)
-                    login_result = auth_mgr.login(
-                        account.username,
-                        account.password,
-                        retry_times=self.performance_config.get("retry_times", 3)
-                    )
-
-                    if not login_result.success:
-                        raise Exception(login_result.message)
-
+                # 从池中获取浏览器实例并完成登录（失败时归还浏览器并退避重试）
+                # 浏览器仅在登录、提取余额与同步额度期间占用，后续处理在归还后进行
+                sync_success = None
+                sync_message = ""
+                with self._logged_in_session(account) as auth_mgr:
                     # 提取余额
-                    balance_ext = BalanceExtractor(browser_mgr)
+                    balance_ext = BalanceExtractor(auth_mgr.browser)
                     balance, success = balance_ext.extract_balance()
-                    query_source = "web"
-                    query_source_detail = "browser_login_flow"
 
                     # 查询成功后，尝试同步首个 API Key 额度为当前余额（失败不影响主流程）
-                    sync_success = None
-                    sync_message = ""
                     if success:
-                        # 仅在余额提取成功后记录当天网页登录成功（签到成功）
-                        self._mark_web_query_success(username)
                         sync_success, sync_message = auth_mgr.sync_first_apikey_limit(balance)
-                        self.logger.debug(
-                            f"账号 {username} 同步结果详情: success={sync_success}, message={sync_message}"
-                        )
-                        if sync_success:
-                            self.logger.info(f"账号 {username} 首个 API Key 额度同步成功")
-                        else:
-                            self.logger.warning(f"账号 {username} 首个 API Key 额度同步失败: {sync_message}")
-
-                        # 网页流程结束后，同轮立即尝试一次API秒查，避免必须等下一轮调度
-                        if account.api_key:
-                            self.logger.debug(f"账号 {username} 开始同轮 API 秒刷新")
-                            post_web_api_result = self.api_balance_client.query_balance(account.api_key)
-                            if post_web_api_result.success and post_web_api_result.balance is not None:
-                                fast_balance = f"${post_web_api_result.balance:.1f}"
-                                balance = fast_balance
-                                query_source = "api"
-                                query_source_detail = f"{post_web_api_result.source}|post_web_refresh"
-                                self.logger.info(
-                                    f"账号 {username} 同轮 API 秒刷新成功: {fast_balance} "
-                                    f"(source={post_web_api_result.source})"
-                                )
-                            else:
-                                self.logger.debug(
-                                    f"账号 {username} 同轮 API 秒刷新失败，保留网页结果: "
-                                    f"{post_web_api_result.message}"
-                                )
+
+                query_source = "web"
+                query_source_detail = "browser_login_flow"
+                if success:
+                    # 仅在余额提取成功后记录当天网页登录成功（签到成功）
+                    self._mark_web_query_success(username)
+                    self.logger.debug(
+                        "账号 %s 同步结果详情: success=%s, message=%s", username, sync_success, sync_message
+                    )
+                    if sync_success:
+                        self.logger.info("账号 %s 首个 API Key 额度同步成功", username)
+                    else:
+                        self.logger.warning("账号 %s 首个 API Key 额度同步失败: %s", username, sync_message)
+
+                    # 网页流程结束后，同轮立即尝试一次API秒查，避免必须等下一轮调度
+                    if account.api_key:
+                        self.logger.debug("账号 %s 开始同轮 API 秒刷新", username)
+                        post_web_api_result = self.api_balance_client.query_balance(account.api_key)
+                        if post_web_api_result.success and post_web_api_result.balance is not None:
+                            fast_balance = f"${post_web_api_result.balance:.1f}"
+                            balance = fast_balance
+                            query_source = "api"
+                            query_source_detail = f"{post_web_api_result.source}|post_web_refresh"
+                            self.logger.info(
+                                "账号 %s 同轮 API 秒刷新成功: %s (source=%s)",
+                                username, fast_balance, post_web_api_result.source
+                            )
                         else:
                             self.logger.debug(
-                                f"账号 {username} 未配置 API Key，无法执行同轮 API 秒刷新"
+                                "账号 %s 同轮 API 秒刷新失败，保留网页结果: %s",
+                                username, post_web_api_result.message
                             )
-
-                        # 使用最终余额更新本地缓存，供下次启动快速显示
-                        self._update_balance_cache(
-                            username=username,
-                            balance=balance,
-                            apikey_sync_success=sync_success,
-                            apikey_sync_message=sync_message
-                        )
                     else:
-                        self.logger.debug(
-                            f"账号 {username} 余额提取失败，本次不记录当天网页登录签到成功"
-                        )
+                        self.logger.debug("账号 %s 未配置 API Key，无法执行同轮 API 秒刷新", username)
+
+                    # 使用最终余额更新本地缓存，供下次启动快速显示
+                    self._update_balance_cache(
+                        username=username,
+                        balance=balance,
+                        apikey_sync_success=sync_success,
+                        apikey_sync_message=sync_message
+                    )
+                else:
+                    self.logger.debug("账号 %s 余额提取失败，本次不记录当天网页登录签到成功", username)
 
-                    # 更新状态
-                    with self.status_lock:
-                        if username in self.account_status:
-                            status = self.account_status[username]
-                            status.balance = balance
-                            status.status = "正常" if success else "异常"
-                            status.last_check = datetime.now()
-                            status.error_count = 0 if success else status.error_count + 1
-                            status.is_checking = False
-                            status.extra_info["query_source"] = query_source if success else "web"
-                            status.extra_info["query_source_detail"] = query_source_detail if success else "browser_login_flow"
+                # 更新状态
+                with self.status_lock:
+                    if status is not None:
+                        status.balance = balance
+                        status.status = "正常" if success else "异常"
+                        status.last_check_ts = time.time()
+                        status.error_count = 0 if success else status.error_count + 1
+                        status.is_checking = False
+                        status.extra_info["query_source"] = query_source if success else "web"
+                        status.extra_info["query_source_detail"] = query_source_detail if success else "browser_login_flow"
 
-                    # 触发余额更新回调
-                    if self.on_balance_update:
-                        self.on_balance_update(username, balance, success)
+                # 触发余额更新回调
+                if self.on_balance_update:
+                    self.on_balance_update(username, balance, success)
 
-                    self.logger.info(f"账号 {username} 检查完成: {balance} (耗时: {time.time() - metrics.start_time:.2f}秒)")
-                    return username, balance, success
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "账号 %s 检查完成: %s (耗时: %.2f秒)",
+                        username, balance, time.time() - metrics.start_time
+                    )
+                return username, balance, success
 
             except Exception as e:
                 error_msg = str(e)
-                self.logger.error(f"账号 {username} 检查失败: {error_msg}")
+                self.logger.error("账号 %s 检查失败: %s", username, error_msg)
 
                 # 更新错误状态
                 with self.status_lock:
-                    if username in self.account_status:
-                        status = self.account_status[username]
+                    if status is not None:
                         status.balance = "错误"
                         status.status = "异常"
-                        status.last_check = datetime.now()
+                        status.last_check_ts = time.time()
                         status.error_count += 1
                         status.is_checking = False
 
@@ -533,12 +640,26 @@ class BalanceMonitorService:
 
                 raise  # 重新抛出异常，让OperationTimer记录失败
 
-    def check_all_accounts(self, accounts: Optional[List[Account]] = None) -> List[Tuple[str, str, bool]]:
+    def check_all_accounts(self, accounts: Optional[List[Account]] = None,
+                           max_workers: Optional[int] = None,
+                           cancel_event: Optional[Event] = None,
+                           on_poll: Optional[Callable[[], None]] = None) -> List[Tuple[str, str, bool]]:
         """检查所有账号 - 使用并行查询（无头模式）"""
-        return self.check_all_accounts_parallel(accounts)
-
-    def check_all_accounts_parallel(self, accounts: Optional[List[Account]] = None) -> List[Tuple[str, str, bool]]:
-        """并发检查所有账号（headless模式下并行查询）- 性能优化版"""
+        return self.check_all_accounts_parallel(accounts, max_workers, cancel_event, on_poll)
+
+    def check_all_accounts_parallel(self, accounts: Optional[List[Account]] = None,
+                                    max_workers: Optional[int] = None,
+                                    cancel_event: Optional[Event] = None,
+                                    on_poll: Optional[Callable[[], None]] = None) -> List[Tuple[str, str, bool]]:
+        """
+        并发检查所有账号（headless模式下并行查询）- 性能优化版
+
+        Args:
+            accounts: 待检查账号，默认全部账号
+            max_workers: 并发线程数，默认使用服务配置；不超过浏览器池上限与账号数
+            cancel_event: 取消事件，置位后不再等待剩余账号，未开始的任务直接取消
+            on_poll: 等待结果期间每轮轮询（约0.2秒）在调用线程中回调一次
+        """
         if accounts is None:
             accounts = self.config.accounts
 
@@ -550,63 +671,135 @@ class BalanceMonitorService:
         with OperationTimer(self.perf_monitor, "批量查询账号",
                            {"count": len(accounts)}) as batch_metrics:
 
-            self.logger.info(f"开始检查 {len(accounts)} 个账号")
+            self.logger.info("开始检查 %d 个账号", len(accounts))
             results = []
 
-            # 使用线程池并发执行
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # 提交所有任务
-                futures = {
-                    executor.submit(self.check_single_account, account): account
-                    for account in accounts
-                }
-
-                # 收集结果
-                for future in as_completed(futures):
-                    try:
-                        result = future.result(
-                            timeout=self.performance_config.get("timeout", 90)
-                        )
-                        results.append(result)
-                    except Exception as e:
-                        account = futures[future]
-                        self.logger.error(f"账号 {account.username} 执行异常: {e}")
-                        results.append((account.username, "超时", False))
-
-            self.logger.info(f"所有账号检查完成，共 {len(results)} 个结果 (总耗时: {time.time() - batch_metrics.start_time:.2f}秒)")
+            if len(accounts) == 1:
+                # 单账号直接在当前线程执行，省去线程池调度开销
+                account = accounts[0]
+                try:
+                    results.append(self.check_single_account(account))
+                except Exception as e:
+                    self.logger.error("账号 %s 执行异常: %s", account.username, e)
+                    results.append((account.username, "超时", False))
+            else:
+                # 使用线程池并发执行（线程数不超过浏览器池上限，也不超过账号数）
+                workers = min(
+                    max_workers or self.max_workers,
+                    self.browser_pool.max_pool_size,
+                    len(accounts)
+                )
+                executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+                cancelled = False
+                try:
+                    # 提交所有任务
+                    futures = {
+                        executor.submit(self.check_single_account, account): account
+                        for account in accounts
+                    }
+
+                    # 收集结果（短超时轮询，以便及时响应取消）；
+                    # 连续 self._timeout 秒没有任何账号完成时视为卡死，剩余账号按超时处理
+                    pending = set(futures)
+                    deadline = time.monotonic() + self._timeout
+                    while pending:
+                        done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                        if done:
+                            deadline = time.monotonic() + self._timeout
+                        for future in done:
+                            try:
+                                results.append(future.result())
+                            except Exception as e:
+                                account = futures[future]
+                                self.logger.error("账号 %s 执行异常: %s", account.username, e)
+                                results.append((account.username, "超时", False))
+                        if on_poll is not None:
+                            on_poll()
+
+                        if not pending:
+                            break
+                        if cancel_event is not None and cancel_event.is_set():
+                            cancelled = True
+                            self.logger.info("批量查询已取消，剩余 %d 个账号未完成", len(pending))
+                            break
+                        if time.monotonic() >= deadline:
+                            cancelled = True
+                            self.logger.error(
+                                "批量查询超过 %s 秒无进展，剩余 %d 个账号按超时处理",
+                                self._timeout, len(pending)
+                            )
+                            for future in pending:
+                                results.append((futures[future].username, "超时", False))
+                            break
+                finally:
+                    # 取消或超时时不等待进行中的查询，未开始的任务直接丢弃
+                    # （逐个 cancel 而非 shutdown(cancel_futures=...)，后者需要 Python 3.9+）
+                    if cancelled:
+                        for future in pending:
+                            future.cancel()
+                    executor.shutdown(wait=not cancelled)
 
             # 打印性能报告
             if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "所有账号检查完成，共 %d 个结果 (总耗时: %.2f秒)",
+                    len(results), time.time() - batch_metrics.start_time
+                )
                 pool_stats = self.browser_pool.get_stats()
-                self.logger.info(f"浏览器池统计: 复用率={pool_stats.get('reuse_rate', 0):.1f}%, "
-                               f"可用实例={pool_stats.get('available_count', 0)}")
+                self.logger.info(
+                    "浏览器池统计: 复用率=%.1f%%, 可用实例=%s",
+                    pool_stats.get('reuse_rate', 0), pool_stats.get('available_count', 0)
+                )
 
             return results
 
     def start_periodic_check(self, interval: Optional[int] = None):
-        """启动定期检查"""
+        """启动定期检查（间隔不为正数时使用默认间隔）"""
         if interval is None:
-            interval = self.performance_config.get("query_interval", 60)
+            interval = self._query_interval
+        if interval <= 0:
+            self.logger.warning(
+                "定期检查间隔无效(%s)，改用默认 %d 秒", interval, self.DEFAULT_QUERY_INTERVAL
+            )
+            interval = self.DEFAULT_QUERY_INTERVAL
 
-        self.logger.info(f"启动定期检查，间隔 {interval} 秒")
+        self.logger.info("启动定期检查，间隔 %s 秒", interval)
 
-        import threading
-        self.check_thread = threading.Thread(
+        self._stop.clear()
+        _periodic_services.add(self)
+        self.check_thread = Thread(
             target=self._periodic_check_worker,
             args=(interval,),
             daemon=True
         )
         self.check_thread.start()
 
+    def stop_periodic_check(self, timeout: Optional[float] = None):
+        """停止定期检查，等待当前轮次结束"""
+        self._stop.set()
+        _periodic_services.discard(self)
+        if self.check_thread and self.check_thread.is_alive():
+            self.check_thread.join(timeout)
+        self.check_thread = None
+
     def _periodic_check_worker(self, interval: int):
-        """定期检查工作线程"""
-        while True:
+        """定期检查工作线程 - 固定节拍调度，上一轮超时则跳过错过的节拍"""
+        next_t = time.monotonic()
+        while not self._stop.is_set():
+            next_t += interval
             try:
-                self.check_all_accounts()
+                # 停止事件同时作为取消事件，退出时正在进行的一轮也能尽快结束
+                self.check_all_accounts(cancel_event=self._stop)
             except Exception as e:
-                self.logger.error(f"定期检查异常: {e}")
+                self.logger.error("定期检查异常: %s", e)
 
-            time.sleep(interval)
+            sleep_for = next_t - time.monotonic()
+            if sleep_for < 0:
+                skipped = int(-sleep_for // interval) + 1
+                next_t += skipped * interval
+                self.logger.warning("定期检查耗时超过间隔，跳过 %d 个周期", skipped)
+                sleep_for = next_t - time.monotonic()
+            self._stop.wait(sleep_for)
 
     def get_account_status(self, username: str) -> Optional[AccountStatus]:
         """获取账号状态"""
@@ -661,8 +854,7 @@ class BalanceMonitorService:
             checking = sum(1 for s in self.account_status.values() if s.is_checking)
 
             # 添加性能统计
-            perf_stats = self.perf_monitor.get_stats()
-            system_metrics = self.perf_monitor.get_system_metrics()
+            perf_stats, system_metrics = self._get_cached_perf_stats()
             pool_stats = self.browser_pool.get_stats() if self.browser_pool else {}
 
             return {
@@ -676,11 +868,29 @@ class BalanceMonitorService:
                 "browser_pool": pool_stats
             }
 
+    def _get_cached_perf_stats(self) -> Tuple[Dict, Dict]:
+        """获取性能统计，有效期内直接返回缓存"""
+        perf_stats, system_metrics, ts = self._perf_cache
+        now = time.monotonic()
+        if ts and now - ts < self.PERF_STATS_TTL:
+            return perf_stats, system_metrics
+
+        perf_stats = self.perf_monitor.get_stats()
+        system_metrics = self.perf_monitor.get_system_metrics()
+        self._perf_cache = (perf_stats, system_metrics, now)
+        return perf_stats, system_metrics
+
     def get_performance_report(self) -> str:
         """获取性能报告"""
         return self.perf_monitor.generate_report()
 
 
+def stop_all_periodic_checks(timeout: Optional[float] = 1.0):
+    """停止所有服务的定期检查（退出清理时调用，单个服务最多等待 timeout 秒）"""
+    for service in list(_periodic_services):
+        service.stop_periodic_check(timeout)
+
+
 if __name__ == "__main__":
     # 测试监控服务
     logging.basicConfig(
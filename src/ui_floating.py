@@ -6,61 +6,541 @@
 
 import os
 import sys
+import time
 import json
 import logging
+import shutil
+import tempfile
 import subprocess
+import threading
+from collections import Counter
+from functools import lru_cache, partial
 from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTableWidget, QTableWidgetItem, QPushButton, QLabel, QMenu,
-    QMessageBox, QHeaderView, QTextEdit
+    QMessageBox, QHeaderView, QPlainTextEdit, QDialog
 )
 from PyQt6.QtCore import (
-    Qt, QThread, pyqtSignal, QTimer, QPoint, QRect, QSize
+    Qt, QThread, pyqtSignal, QTimer, QPoint, QRect, QSize,
+    QObject, QRunnable, QThreadPool
 )
 from PyQt6.QtGui import (
     QAction, QPainter, QBrush, QColor, QFont, QPen,
-    QLinearGradient, QCursor
+    QLinearGradient, QCursor, QShortcut, QKeySequence, QPixmap
 )
 
 from src.config_manager import ConfigManager, Account
 from src.monitor_service import BalanceMonitorService
 
+# Claude/Codex 配置读写优先使用 orjson（可选依赖），未安装时回退标准库
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    orjson = None
+
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+_LOGGER = logging.getLogger(__name__)
+
+# Claude/Codex 默认配置路径，模块加载时解析一次
+_CLAUDE_SETTINGS_PATH = Path.home() / ".claude" / "settings.json"
+_DEFAULT_CODEX_AUTH_PATH = Path.home() / ".codex" / "auth.json"
+
+
+def _stat_key(path: Path) -> Tuple[int, int]:
+    """配置文件缓存校验键: (修改时间ns, 文件大小)，同一时间粒度内的改写也能识别"""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+# 只需读取Claude当前Token时优先用 ijson（可选依赖）流式提取，找到即停止解析
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_CLAUDE_TOKEN_PREFIX = "env.ANTHROPIC_AUTH_TOKEN"
+
+# 进度日志时间戳与分隔线
+_PROGRESS_TIME_FORMAT = "%H:%M:%S"
+PROGRESS_MAX_BLOCKS = 200
+_CLEANUP_MAX_BLOCKS = 100  # 退出清理日志只有数十行，上限取小值
+_PROGRESS_SEP = "=" * 50
+_CLEANUP_SEP = "=" * 40
+
+# 清理日志级别颜色及预先生成的 <span> 起始标签
+_CLEANUP_LOG_COLORS = {
+    "info": "#90b0ff",
+    "success": "#50ff80",
+    "warning": "#ffb050",
+    "error": "#ff5050",
+    "debug": "#a0a0d0"
+}
+_CLEANUP_LOG_SPANS = {
+    level: '<span style="color: %s;">' % color for level, color in _CLEANUP_LOG_COLORS.items()
+}
+_CLEANUP_LOG_DEFAULT_SPAN = '<span style="color: #b0b0e0;">'
+
+
+def _timestamp() -> str:
+    """当前时间戳（time.strftime 无需构造 datetime 对象）"""
+    return time.strftime(_PROGRESS_TIME_FORMAT)
+
+
+@lru_cache(maxsize=8)
+def _list_dir_names(directory: str) -> frozenset:
+    """列出目录下的条目名（带缓存），用于一次性探测 \\wsl.localhost 等慢速网络根目录"""
+    try:
+        with os.scandir(directory) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _unique_paths(paths: List[Path]) -> List[Path]:
+    """路径去重（保持原有顺序）"""
+    return list(dict.fromkeys(paths))
+
+
+# 余额文本中需要去除的货币符号与千分位
+_BALANCE_STRIP_TABLE = str.maketrans("", "", "$¥,")
+
+
+def _parse_balance(balance_text: str) -> Optional[float]:
+    """解析余额文本（移除可能的货币符号和格式），无法解析时返回 None"""
+    try:
+        return float(balance_text.translate(_BALANCE_STRIP_TABLE))
+    except (ValueError, AttributeError):
+        return None
+
+
+# 账号显示名称的状态标记前缀: ●=Claude当前Token, ◎=OpenAI当前Key
+_DISPLAY_MARKER_PREFIX = {
+    (False, False): "",
+    (True, False): "● ",
+    (False, True): "◎ ",
+    (True, True): "●◎ "
+}
+# 刷新显示名称时超过该行数才暂停表格重绘（切换Token通常仅变化两行）
+_DISPLAY_BATCH_THRESHOLD = 2
+
+# 表格状态列文字画刷（setForeground 直接使用，免去每次由 QColor 隐式构造 QBrush）
+_STATUS_CACHE_BRUSH = QBrush(QColor("#ffcc66"))
+_STATUS_OK_BRUSH = QBrush(QColor("#4caf50"))
+_STATUS_ERR_BRUSH = QBrush(QColor("#f44336"))
+
+# 收缩状态光晕层: (半径增量, 画刷)，由内向外逐层变淡
+_GLOW_LAYERS = tuple(
+    (i * 3, QBrush(QColor(128, 128, 255, 30 - i * 10))) for i in range(3)
+)
+
+# 退出动画对话框样式
+_CLOSING_DIALOG_STYLESHEET = """
+    QDialog {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 rgba(25, 25, 35, 245),
+            stop:1 rgba(35, 35, 50, 245));
+        border-radius: 12px;
+        border: 2px solid rgba(120, 120, 255, 0.5);
+    }
+    QLabel#title {
+        color: #e0e0ff;
+        font-size: 12px;
+        font-weight: bold;
+        background: transparent;
+        padding: 4px;
+    }
+    QPlainTextEdit {
+        background: rgba(15, 15, 25, 150);
+        border: 1px solid rgba(80, 80, 120, 0.3);
+        border-radius: 6px;
+        color: #b0b0e0;
+        font-size: 8px;
+        font-family: 'Consolas', 'Monaco', monospace;
+        padding: 4px;
+        line-height: 1.2;
+    }
+"""
+
+
+def _repolish(widget: QWidget):
+    """动态属性变化后重新套用样式表（不重新解析样式表）"""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+# 键盘快捷键: (按键, 槽函数名)
+_SHORTCUTS = (
+    ("Ctrl+Q", "close"),                     # 退出
+    ("F5", "query"),                         # 刷新查询
+    ("Esc", "direct_collapse"),              # 收缩窗口
+    ("Ctrl+L", "toggle_progress"),           # 切换进度日志
+    ("Ctrl+Shift+C", "copy_total_balance"),  # 复制总余额
+)
+
+# WSL 输出解码候选编码
+_WSL_UTF16_ENCODINGS = ("utf-16-le", "utf-8", "gbk")
+_WSL_TEXT_ENCODINGS = ("utf-8", "gbk")
+
+# 界面样式表
+# 内容区按动态属性 state 区分收缩（圆形）/展开样式，切换状态时无需重新解析样式表
+_MAIN_STYLESHEET = """
+    #content[state="expanded"],
+    #content[state="expanded"]:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 rgba(20, 20, 30, 230),
+            stop:1 rgba(30, 30, 45, 230));
+        border-radius: 25px;
+        border: 1px solid rgba(100, 100, 255, 0.2);
+    }
+    #content[state="collapsed"] {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 rgba(50, 50, 80, 200),
+            stop:1 rgba(80, 60, 100, 200));
+        border-radius: 25px;
+        border: 2px solid rgba(130, 130, 255, 0.5);
+    }
+    #content[state="collapsed"]:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 rgba(60, 60, 90, 220),
+            stop:1 rgba(90, 70, 110, 220));
+        border: 2px solid rgba(150, 150, 255, 0.7);
+    }
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #5555ff,
+            stop:1 #8855ff);
+        border: none;
+        border-radius: 12px;
+        color: white;
+        font-size: 11px;
+        font-weight: bold;
+        padding: 4px 8px;
+        min-height: 18px;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #6666ff,
+            stop:1 #9966ff);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #4444ee,
+            stop:1 #7744ee);
+    }
+    QTableWidget {
+        background: rgba(20, 20, 30, 100);
+        border: 1px solid rgba(100, 100, 255, 0.1);
+        border-radius: 6px;
+        color: #e0e0e0;
+        gridline-color: rgba(100, 100, 255, 0.05);
+        selection-background-color: rgba(100, 100, 255, 0.3);
+    }
+    QTableWidget::item {
+        padding: 2px;
+        border: none;
+    }
+    QTableWidget::item:selected {
+        background: rgba(100, 100, 255, 0.3);
+    }
+    QHeaderView::section {
+        background: rgba(40, 40, 60, 180);
+        color: #c0c0ff;
+        border: none;
+        padding: 2px;
+        font-size: 10px;
+        font-weight: bold;
+    }
+    QPlainTextEdit {
+        background: rgba(15, 15, 25, 80);
+        border: none;
+        color: #a0a0d0;
+        font-size: 8px;
+        padding: 2px;
+        line-height: 1.3;
+    }
+    QScrollBar:vertical {
+        background: rgba(20, 20, 30, 50);
+        width: 6px;
+        border-radius: 3px;
+    }
+    QScrollBar::handle:vertical {
+        background: rgba(100, 100, 255, 0.3);
+        border-radius: 3px;
+        min-height: 15px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: rgba(100, 100, 255, 0.5);
+    }
+    QScrollBar::add-line:vertical,
+    QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QLabel {
+        color: #a0a0c0;
+        background: transparent;
+    }
+    QLabel#env {
+        font-size: 8px;
+        color: #7070a0;
+        padding: 1px;
+    }
+    QMenu {
+        background: rgba(25, 25, 35, 240);
+        border: 1px solid rgba(100, 100, 255, 0.2);
+        border-radius: 6px;
+    }
+    QMenu::item {
+        color: #e0e0e0;
+        padding: 5px 15px;
+        border-radius: 3px;
+        margin: 2px 3px;
+    }
+    QMenu::item:selected {
+        background: rgba(100, 100, 255, 0.3);
+    }
+    QMenu::separator {
+        height: 1px;
+        background: rgba(100, 100, 255, 0.1);
+        margin: 3px 6px;
+    }
+"""
+
+_COLLAPSED_LABEL_STYLESHEET = """
+    QLabel {
+        color: #e0e0ff;
+        font-size: 13px;
+        font-weight: bold;
+        background: transparent;
+    }
+"""
+
+_QUIT_BTN_STYLESHEET = """
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #ff5555,
+            stop:1 #ff8855);
+        border: none;
+        border-radius: 12px;
+        color: white;
+        font-size: 10px;
+        font-weight: bold;
+        padding: 4px 8px;
+        min-height: 18px;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #ff6666,
+            stop:1 #ff9966);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #ee4444,
+            stop:1 #ee7744);
+    }
+"""
+
+_TOGGLE_BTN_STYLESHEET = """
+    QPushButton {
+        background: rgba(60, 60, 80, 100);
+        border: none;
+        border-radius: 3px;
+        color: #a0a0c0;
+        font-size: 8px;
+        padding: 1px 3px;
+    }
+    QPushButton:hover {
+        background: rgba(80, 80, 100, 150);
+    }
+"""
+
+# 总余额标签按动态属性 state 区分有数据(active)/无数据(empty)，切换时无需重新解析样式表
+_TOTAL_LABEL_STYLESHEET = """
+    QLabel {
+        font-size: 10px;
+        color: #90d090;
+        padding: 2px;
+        font-weight: bold;
+    }
+    QLabel[state="active"] {
+        font-size: 12px;
+        color: #90ff90;
+        padding: 4px;
+    }
+    QLabel[state="empty"] {
+        font-size: 12px;
+        color: #a0a0c0;
+        padding: 4px;
+    }
+"""
+
 
 class MonitorWorker(QThread):
     """监控工作线程"""
-    result = pyqtSignal(str, str, bool)  # username, balance, success
-    progress = pyqtSignal(str, str)  # username, progress_message
+    results_batch = pyqtSignal(int, list)  # run_id, [(username, balance, success), ...]
     finished = pyqtSignal()
 
-    def __init__(self, service: BalanceMonitorService):
+    # 查询结果攒批发送：达到条数或距上次发送超过间隔（秒）即发出一次信号
+    RESULT_BATCH_SIZE = 8
+    RESULT_BATCH_INTERVAL = 0.2
+
+    def __init__(self, service: BalanceMonitorService, max_workers: Optional[int] = None):
         super().__init__()
         self.service = service
+        self.max_workers = max_workers
+        # 查询线程池回调只向缓冲区追加，信号统一由工作线程发出，保证全部批次先于 finished
+        self._batch: List[Tuple[str, str, bool]] = []
+        self._batch_lock = threading.Lock()
+        self._last_flush = 0.0
+        self._run_ident: Optional[int] = None
+        self._cancel = threading.Event()
+        # 查询轮次编号：每次 restart 递增，上一轮（如已取消）迟到的回调与批次据此丢弃
+        self.run_id = 0
         # 设置为守护线程，主程序退出时自动结束
         self.setTerminationEnabled(True)
 
+    def restart(self):
+        """复用同一线程对象开始新一轮查询（清除上一轮的停止请求）"""
+        self._cancel.clear()
+        self.run_id += 1
+        self.start()
+
+    def stop(self):
+        """请求停止查询：不再等待剩余账号，run 随后尽快返回"""
+        self.requestInterruption()
+        self._cancel.set()
+
+    def _on_result(self, run_id: int, username: str, balance: str, success: bool):
+        """收集单个查询结果（可能在查询线程池中调用），非本轮的结果直接丢弃"""
+        with self._batch_lock:
+            if run_id != self.run_id:
+                return
+            self._batch.append((username, balance, success))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        """达到条数或间隔时发出攒批；仅在工作线程内生效，其他线程的回调等待下一轮轮询"""
+        if threading.get_ident() != self._run_ident:
+            return
+        with self._batch_lock:
+            if not self._batch:
+                return
+            due = (len(self._batch) >= self.RESULT_BATCH_SIZE
+                   or time.monotonic() - self._last_flush >= self.RESULT_BATCH_INTERVAL)
+        if due:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        """发出已收集的查询结果（仅在工作线程中调用）"""
+        with self._batch_lock:
+            items = self._batch
+            self._batch = []
+            self._last_flush = time.monotonic()
+            run_id = self.run_id
+        if items:
+            self.results_batch.emit(run_id, items)
+
     def run(self):
         """执行监控任务"""
-        # 设置回调
-        self.service.on_balance_update = lambda u, b, s: self.result.emit(u, b, s)
-        self.service.on_progress = lambda u, m: self.progress.emit(u, m)
+        self._run_ident = threading.get_ident()
+        with self._batch_lock:
+            self._batch = []
+            self._last_flush = time.monotonic()
 
-        # 执行检查
-        results = self.service.check_all_accounts()
+        # 设置回调（绑定本轮编号）
+        self.service.on_balance_update = partial(self._on_result, self.run_id)
+
+        # 执行检查（等待结果的轮询在本线程进行，顺带发出到期的攒批）
+        try:
+            self.service.check_all_accounts(
+                max_workers=self.max_workers,
+                cancel_event=self._cancel,
+                on_poll=self._maybe_flush
+            )
+        finally:
+            # 剩余结果须在 finished 之前发出，保证完成统计准确
+            self._flush_batch()
+            self._run_ident = None
 
         self.finished.emit()
 
 
+class ConfigLoaderSignals(QObject):
+    """外部配置加载信号"""
+    finished = pyqtSignal(dict)  # 外部配置读取结果，附带加载开始时的修改代数
+
+
+class ConfigLoader(QRunnable):
+    """后台加载Claude/Codex外部配置，避免WSL枚举与文件读取阻塞UI线程"""
+
+    def __init__(self, monitor: "FloatingMonitor"):
+        super().__init__()
+        self.monitor = monitor
+        self.signals = ConfigLoaderSignals()
+        # 在UI线程记录加载开始时的修改代数，完成时据此跳过用户期间已修改的字段
+        self.token_generation = monitor._token_generation
+        self.openai_key_generation = monitor._openai_key_generation
+
+    def run(self):
+        """执行配置加载（只读取并返回结果，不修改窗口对象的属性）"""
+        codex_auth_path, local_paths, wsl_targets = self.monitor._resolve_codex_auth_path()
+        self.signals.finished.emit({
+            "codex_auth_path": codex_auth_path,
+            "local_codex_paths": local_paths,
+            "wsl_targets": wsl_targets,
+            "current_env_token": self.monitor._load_current_token(),
+            "current_openai_key": self.monitor._load_current_openai_key(local_paths, wsl_targets),
+            "token_generation": self.token_generation,
+            "openai_key_generation": self.openai_key_generation
+        })
+
+
+class CleanupTaskSignals(QObject):
+    """后台清理步骤信号"""
+    log = pyqtSignal(str, str)  # message, level
+    finished = pyqtSignal()
+
+
+class CleanupTask(QRunnable):
+    """在线程池中执行单个退出清理步骤，日志通过信号回到UI线程显示"""
+
+    def __init__(self, step):
+        super().__init__()
+        self.step = step
+        self.signals = CleanupTaskSignals()
+
+    def run(self):
+        """执行清理步骤"""
+        try:
+            self.step(self.signals.log.emit)
+        finally:
+            self.signals.finished.emit()
+
+
 class FloatingMonitor(QMainWindow):
     """悬浮监控窗口 - 仿照原版"""
 
+    # 关闭窗口后等待正常退出的最长秒数，超时强制结束进程
+    EXIT_WATCHDOG_SECONDS = 1.5
+
     def __init__(self):
         super().__init__()
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOGGER
 
         # 初始化配置和服务
         self.config = ConfigManager()
@@ -68,132 +548,288 @@ class FloatingMonitor(QMainWindow):
 
         # 工作线程
         self.worker: Optional[MonitorWorker] = None
+        self._query_run_id = 0  # 当前查询轮次编号，对应 MonitorWorker.run_id
 
         # UI状态
         self.is_expanded = False
         self.drag_pos: Optional[QPoint] = None
-        self.hover_timer = QTimer()
-        self.hover_timer.timeout.connect(self.start_collapse)
+        # 延迟收缩：记录到期时间，最多只挂起一个 QTimer.singleShot，
+        # 重复调度只推迟到期时间，不再反复创建/停止计时器
+        self._collapse_due: Optional[float] = None
+        self._collapse_timer_armed = False
         self.collapsed_center = None  # 记忆小圆圈的中心点
 
+        # 拖动移动节流（约60Hz）：鼠标事件只记录目标位置，由计时器合并执行 move
+        self._pending_move_pos: Optional[QPoint] = None
+        self._last_move_pos: Optional[QPoint] = None
+        self._move_throttle = QTimer(self)
+        self._move_throttle.setSingleShot(True)
+        self._move_throttle.setInterval(16)
+        self._move_throttle.timeout.connect(self._flush_move)
+
+        # 收缩状态光晕预渲染缓存
+        self._glow_pixmap: Optional[QPixmap] = None
+        self._glow_key: Optional[Tuple[int, int, float]] = None
+        self._glow_bounds = QRect()
+
+        # 当前窗口光标形状
+        self._current_cursor: Optional[Qt.CursorShape] = None
+
+        # 内容区当前样式表（收缩/展开切换时比较，避免重复设置）
+        self._content_state: Optional[str] = None
+
+        # 展开目标位置缓存: ((中心x, 中心y), (目标x, 目标y))，屏幕可用区域变化时失效
+        self._expand_cache: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
+        self._primary_screen = None
+
+        # 进度日志合并刷新，避免逐条信号触发重绘
+        self._pending_progress: List[str] = []
+        self._progress_flush_timer = QTimer(self)
+        self._progress_flush_timer.setSingleShot(True)
+        self._progress_flush_timer.setInterval(50)
+        self._progress_flush_timer.timeout.connect(self._flush_progress)
+
+        # 表格数据按列存储（与表格行一一对应），统计时直接读取而不访问单元格
+        self._row_values: List[Optional[float]] = []  # 计入总余额的数值，None 表示不计入
+        self._row_statuses: List[str] = []
+        self._row_display_names: List[str] = []  # 用户列当前显示文本
+        # 用户/余额/状态列单元格引用，按行下标直接访问，免去 table.item() 查找
+        self._name_items: List[QTableWidgetItem] = []
+        self._balance_items: List[QTableWidgetItem] = []
+        self._status_items: List[QTableWidgetItem] = []
+        self._username_to_row: Dict[str, int] = {}  # 用户名 -> 表格行号
+        self._key_to_username: Dict[str, str] = {}  # API Key -> 用户名
+        self._key_to_rows: Dict[str, List[int]] = {}  # API Key -> 使用该Key的行号
+        self._row_name_variants: List[Dict[Tuple[bool, bool], str]] = []
+        self._indexed_usernames: Tuple[str, ...] = ()  # 建立以上索引时的账号用户名（按行顺序）
+        # 表格用户列标记当前对应的 (Claude Token, OpenAI Key)
+        self._marked_pair: Optional[Tuple[str, str]] = None
+
+        # 总余额增量维护，仅在有变化时重新渲染
+        self._values_total = 0.0
+        self._values_count = 0
+        self._total_dirty = True
+        self._total_label_state: Optional[str] = None
+        # 总余额刷新防抖：连续的结果批次只在最后一次之后合并渲染一次
+        self._total_update_timer = QTimer(self)
+        self._total_update_timer.setSingleShot(True)
+        self._total_update_timer.setInterval(50)
+        self._total_update_timer.timeout.connect(self.update_total_balance)
+
+        self._clipboard = QApplication.clipboard()
+
+        # 退出动画对话框，首次退出时构造
+        self.cleanup_dialog: Optional[QDialog] = None
+        self.cleanup_progress_text: Optional[QPlainTextEdit] = None
+
+        # 外部配置JSON解析缓存: path -> ((st_mtime_ns, st_size), settings)
+        # 后台配置加载任务也会读取，访问缓存时加锁
+        self._settings_cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        # 流式提取的Claude Token缓存: path -> ((st_mtime_ns, st_size), token)
+        self._token_cache: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self._settings_cache_lock = threading.Lock()
+
         # 配置文件路径
-        self.claude_settings_path = Path.home() / ".claude" / "settings.json"
-        self.codex_auth_path = self._resolve_codex_auth_path()
+        self.claude_settings_path = _CLAUDE_SETTINGS_PATH
+        self.wsl_cache_file = Path(self.config.config_dir) / "wsl_cache.json"
+        self._wsl_exe: Optional[str] = None
+        self.codex_auth_path = _DEFAULT_CODEX_AUTH_PATH
+        self.local_codex_paths: List[Path] = []
+        self.wsl_targets: List[Dict[str, Any]] = []
+
+        # 当前外部配置，由后台任务加载完成后填充
+        self.current_env_token = ""
+        self.current_openai_key = ""
+        self._external_config_loaded = False
+        # 用户修改Claude Token / Codex配置的代数，后台加载结果只在代数未变时生效
+        self._token_generation = 0
+        self._openai_key_generation = 0
 
-        # 读取当前外部配置
-        self.current_env_token = self._load_current_token()
-        self.current_openai_key = self._load_current_openai_key()
+        # 主屏可用区域缓存，随主屏切换或可用区域变化刷新（init_ui 计算初始位置时直接使用）
+        self._watch_primary_screen(QApplication.primaryScreen())
+        QApplication.instance().primaryScreenChanged.connect(self._watch_primary_screen)
 
         # 初始化UI
         self.init_ui()
         self.load_accounts()
 
+        # 后台读取外部配置（WSL枚举与文件读取），完成后刷新显示
+        self._config_loader = ConfigLoader(self)
+        self._config_loader.signals.finished.connect(self._on_external_config_loaded)
+        QThreadPool.globalInstance().start(self._config_loader)
+
         # 启动时为收缩状态
         self.set_collapsed_state()
 
         # 添加键盘快捷键
-        from PyQt6.QtGui import QShortcut, QKeySequence
-
-        # Ctrl+Q - 退出
-        self.quit_shortcut = QShortcut(QKeySequence("Ctrl+Q"), self)
-        self.quit_shortcut.activated.connect(self.close)
-
-        # F5 - 刷新查询
-        self.refresh_shortcut = QShortcut(QKeySequence("F5"), self)
-        self.refresh_shortcut.activated.connect(self.query)
-
-        # Esc - 收缩窗口
-        self.collapse_shortcut = QShortcut(QKeySequence("Esc"), self)
-        self.collapse_shortcut.activated.connect(self.direct_collapse)
+        self._shortcuts: List[QShortcut] = []
+        for key, slot_name in _SHORTCUTS:
+            shortcut = QShortcut(QKeySequence(key), self)
+            shortcut.activated.connect(getattr(self, slot_name))
+            self._shortcuts.append(shortcut)
+
+    def _on_external_config_loaded(self, result: Dict[str, Any]):
+        """外部配置加载完成，更新当前Token/Key并刷新显示（跳过加载期间用户已修改的字段）"""
+        if result["token_generation"] == self._token_generation:
+            self.current_env_token = result["current_env_token"]
+        if result["openai_key_generation"] == self._openai_key_generation:
+            self.codex_auth_path = result["codex_auth_path"]
+            self.local_codex_paths = result["local_codex_paths"]
+            self.wsl_targets = result["wsl_targets"]
+            self.current_openai_key = result["current_openai_key"]
+        self._config_loader = None
+        self._external_config_loaded = True
+
+        self.refresh_user_display()
+        self.update_env_status_display()
+
+    def _read_json_cached(self, path: Path) -> Dict[str, Any]:
+        """读取JSON配置，文件未修改时直接返回缓存的解析结果（调用方不得修改返回值）"""
+        key = _stat_key(path)
+        with self._settings_cache_lock:
+            cached = self._settings_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        with open(path, 'rb') as f:
+            settings = _json_loads(f.read())
+        with self._settings_cache_lock:
+            self._settings_cache[path] = (key, settings)
+        return settings
+
+    def _write_json_atomic(self, path: Path, settings: Dict[str, Any]):
+        """原子写入JSON配置：先写同目录临时文件，再用 os.replace 替换，避免写入中断损坏配置"""
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_json_dumps(settings))
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
 
-        # Ctrl+L - 切换进度日志
-        self.toggle_log_shortcut = QShortcut(QKeySequence("Ctrl+L"), self)
-        self.toggle_log_shortcut.activated.connect(self.toggle_progress)
+        # 写入内容即最新配置，直接更新解析缓存，下次读取无需重新解析
+        try:
+            key = _stat_key(path)
+        except OSError:
+            key = None
+        with self._settings_cache_lock:
+            if key is None:
+                self._settings_cache.pop(path, None)
+            else:
+                self._settings_cache[path] = (key, settings)
+
+    def _read_claude_token(self, path: Path) -> str:
+        """读取Claude配置中的Token：已有未过期的完整解析缓存时直接取值，否则用 ijson 只解析到该字段"""
+        key = _stat_key(path)
+        with self._settings_cache_lock:
+            cached = self._settings_cache.get(path)
+            cached_token = self._token_cache.get(path)
+        if ijson is not None and (cached is None or cached[0] != key):
+            if cached_token is not None and cached_token[0] == key:
+                return cached_token[1]
+
+            token = ''
+            with open(path, 'rb') as f:
+                for value in ijson.items(f, _CLAUDE_TOKEN_PREFIX):
+                    token = value if isinstance(value, str) else ''
+                    break
+            with self._settings_cache_lock:
+                self._token_cache[path] = (key, token)
+            return token
 
-        # Ctrl+Shift+C - 复制总余额
-        self.copy_total_shortcut = QShortcut(QKeySequence("Ctrl+Shift+C"), self)
-        self.copy_total_shortcut.activated.connect(self.copy_total_balance)
+        # Claude配置格式: {"env": {"ANTHROPIC_AUTH_TOKEN": "..."}}
+        settings = self._read_json_cached(path)
+        return settings.get('env', {}).get('ANTHROPIC_AUTH_TOKEN', '')
 
     def _load_current_token(self) -> str:
         """从Claude配置文件加载当前Token"""
         try:
-            if not self.claude_settings_path.exists():
-                self.logger.warning(f"Claude配置文件不存在: {self.claude_settings_path}")
-                return ""
-
-            with open(self.claude_settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                # Claude配置格式: {"env": {"ANTHROPIC_AUTH_TOKEN": "..."}}
-                env_settings = settings.get('env', {})
-                token = env_settings.get('ANTHROPIC_AUTH_TOKEN', '')
-                if token:
-                    self.logger.info(f"从Claude配置加载Token: {token[:15]}...")
-                return token
+            token = self._read_claude_token(self.claude_settings_path)
+            if token:
+                self.logger.info(f"从Claude配置加载Token: {token[:15]}...")
+            return token
 
+        except FileNotFoundError:
+            self.logger.warning(f"Claude配置文件不存在: {self.claude_settings_path}")
+            return ""
         except Exception as e:
             self.logger.error(f"读取Claude配置文件失败: {e}")
             return ""
 
-    def _resolve_codex_auth_path(self) -> Path:
-        """解析Codex配置路径，兼容 Windows 与 WSL"""
-        self.local_codex_paths: List[Path] = []
+    def _resolve_codex_auth_path(
+        self, refresh_wsl: bool = False
+    ) -> Tuple[Path, List[Path], List[Dict[str, Any]]]:
+        """解析Codex配置路径，兼容 Windows 与 WSL
+
+        Returns:
+            (Codex配置路径, 本地候选路径, WSL目标)；不修改窗口属性，由调用方在UI线程赋值
+        """
+        local_paths: List[Path] = []
 
         env_override = os.environ.get("CODEX_AUTH_PATH")
         if env_override:
-            self.local_codex_paths.append(Path(env_override).expanduser())
+            local_paths.append(Path(env_override).expanduser())
 
-        default_path = Path.home() / ".codex" / "auth.json"
-        self.local_codex_paths.append(default_path)
+        local_paths.append(_DEFAULT_CODEX_AUTH_PATH)
 
-        # 去除本地路径重复
-        unique_local = []
-        local_seen = set()
-        for path in self.local_codex_paths:
-            normalized = str(path)
-            if normalized in local_seen:
-                continue
-            local_seen.add(normalized)
-            unique_local.append(path)
-        self.local_codex_paths = unique_local
+        # 去除本地路径重复（保持原有顺序）
+        local_paths = _unique_paths(local_paths)
 
         # 枚举 WSL 目标
-        self.wsl_targets = self._discover_wsl_codex_targets()
+        if refresh_wsl:
+            _list_dir_names.cache_clear()
+        wsl_targets = self._discover_wsl_codex_targets(use_cache=not refresh_wsl)
 
-        candidates: List[Path] = list(self.local_codex_paths)
-        for target in self.wsl_targets:
+        candidates: List[Path] = list(local_paths)
+        for target in wsl_targets:
             candidates.append(target["windows_path"])
 
-        unique_candidates: List[Path] = []
-        visited = set()
-        for path in candidates:
-            normalized = str(path)
-            if normalized in visited:
-                continue
-            visited.add(normalized)
-            unique_candidates.append(path)
+        unique_candidates = _unique_paths(candidates)
 
         if not unique_candidates:
-            self.logger.warning("未找到Codex配置候选路径，将使用默认路径: %s", default_path)
-            self.local_codex_paths = [default_path]
-            return default_path
+            self.logger.warning("未找到Codex配置候选路径，将使用默认路径: %s", _DEFAULT_CODEX_AUTH_PATH)
+            return _DEFAULT_CODEX_AUTH_PATH, [_DEFAULT_CODEX_AUTH_PATH], wsl_targets
 
+        # 按父目录分组，每个目录只列举一次
+        dir_entries: Dict[Path, set] = {}
         for path in unique_candidates:
             try:
-                if path.exists():
+                entries = dir_entries.get(path.parent)
+                if entries is None:
+                    with os.scandir(path.parent) as it:
+                        entries = {entry.name for entry in it}
+                    dir_entries[path.parent] = entries
+                if path.name in entries:
                     self.logger.info(f"检测到Codex配置文件: {path}")
-                    return path
+                    return path, local_paths, wsl_targets
+            except FileNotFoundError:
+                dir_entries[path.parent] = set()
             except Exception as e:
                 self.logger.debug(f"检测Codex配置路径失败: {path} - {e}")
 
         fallback = unique_candidates[0]
         self.logger.info(f"未发现现有Codex配置文件，使用候选路径: {fallback}")
-        return fallback
+        return fallback, local_paths, wsl_targets
 
     def _decode_wsl_output(self, data: Optional[bytes]) -> str:
         if not data:
             return ""
 
-        for encoding in ("utf-16-le", "utf-8", "gbk"):
+        # 快速路径：带BOM的UTF-16LE（wsl.exe 自身输出）
+        if data[:2] == b'\xff\xfe':
+            return data[2:].decode("utf-16-le", errors="ignore")
+
+        # 无BOM时按是否含NUL字节区分：UTF-16LE 几乎必含NUL（ASCII内容也是如此），UTF-8/GBK 文本不含
+        has_nul = b"\x00" in data
+        if not has_nul and data.isascii():
+            # 纯ASCII（如 $HOME 路径）直接解码
+            return data.decode("ascii")
+        encodings = _WSL_UTF16_ENCODINGS if has_nul else _WSL_TEXT_ENCODINGS
+        for encoding in encodings:
             try:
                 return data.decode(encoding)
             except UnicodeDecodeError:
@@ -202,6 +838,10 @@ class FloatingMonitor(QMainWindow):
         return data.decode("utf-8", errors="ignore")
 
     def _run_wsl_command(self, args: List[str], timeout: int = 5) -> Tuple[int, str, str]:
+        # 已定位 wsl.exe 时使用绝对路径，省去 PATH 搜索
+        if args and args[0] == "wsl.exe" and self._wsl_exe:
+            args = [self._wsl_exe] + args[1:]
+
         try:
             result = subprocess.run(
                 args,
@@ -219,13 +859,86 @@ class FloatingMonitor(QMainWindow):
         stderr = self._decode_wsl_output(result.stderr)
         return result.returncode, stdout, stderr
 
-    def _discover_wsl_codex_targets(self) -> List[Dict[str, Any]]:
+    def _find_wsl_exe(self) -> Optional[str]:
+        """定位 wsl.exe 绝对路径，未安装WSL时返回 None"""
+        system_wsl = os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "wsl.exe")
+        if os.path.exists(system_wsl):
+            return system_wsl
+        return shutil.which("wsl.exe")
+
+    def _get_wsl_exe_mtime(self, wsl_exe: str) -> float:
+        """获取 wsl.exe 的修改时间，作为WSL缓存的有效性依据"""
+        try:
+            return os.path.getmtime(wsl_exe)
+        except OSError:
+            return 0.0
+
+    def _load_wsl_cache(self, wsl_mtime: float) -> Optional[List[Dict[str, Any]]]:
+        """读取WSL枚举缓存，wsl.exe 未变化时有效"""
+        try:
+            with open(self.wsl_cache_file, 'rb') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.debug(f"读取WSL缓存失败: {e}")
+            return None
+
+        if not isinstance(data, dict) or data.get("wsl_mtime") != wsl_mtime:
+            return None
+
+        targets: List[Dict[str, Any]] = []
+        for item in data.get("targets", []):
+            try:
+                targets.append({
+                    "distro": item["distro"],
+                    "home": item["home"],
+                    "windows_path": Path(item["windows_path"]),
+                    "linux_path": item["linux_path"]
+                })
+            except (KeyError, TypeError):
+                return None
+        return targets
+
+    def _save_wsl_cache(self, wsl_mtime: float, targets: List[Dict[str, Any]]):
+        """保存WSL枚举结果，下次启动时跳过 wsl.exe 调用"""
+        payload = {
+            "version": 1,
+            "wsl_mtime": wsl_mtime,
+            "targets": [
+                {**target, "windows_path": str(target["windows_path"])}
+                for target in targets
+            ]
+        }
+
+        tmp_file = self.wsl_cache_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+            tmp_file.replace(self.wsl_cache_file)
+        except Exception as e:
+            self.logger.debug(f"写入WSL缓存失败: {e}")
+
+    def _discover_wsl_codex_targets(self, use_cache: bool = True) -> List[Dict[str, Any]]:
         """枚举WSL目录下可能存在的Codex配置路径"""
         targets: List[Dict[str, Any]] = []
 
         if os.name != "nt":
             return targets
 
+        # 未安装WSL时直接跳过，避免启动必然失败的子进程
+        self._wsl_exe = self._find_wsl_exe()
+        if not self._wsl_exe:
+            self.logger.debug("当前系统未安装 wsl.exe，跳过 WSL 路径枚举")
+            return targets
+
+        wsl_mtime = self._get_wsl_exe_mtime(self._wsl_exe)
+        if use_cache:
+            cached_targets = self._load_wsl_cache(wsl_mtime)
+            if cached_targets is not None:
+                self.logger.info("使用WSL枚举缓存: %d 个目标", len(cached_targets))
+                return cached_targets
+
         try:
             returncode, stdout, stderr = self._run_wsl_command(["wsl.exe", "-l", "-q"], timeout=5)
         except FileNotFoundError:
@@ -253,8 +966,12 @@ class FloatingMonitor(QMainWindow):
         if not distros:
             return targets
 
+        # 各发行版 HOME 查询互不依赖，并行执行以免串行等待 wsl.exe 启动
+        with ThreadPoolExecutor(max_workers=min(8, len(distros))) as executor:
+            homes = dict(zip(distros, executor.map(self._query_wsl_home, distros)))
+
         for distro in distros:
-            home_path = self._query_wsl_home(distro)
+            home_path = homes.get(distro, "")
             if not home_path:
                 continue
 
@@ -279,6 +996,7 @@ class FloatingMonitor(QMainWindow):
         else:
             self.logger.info("未检测到任何WSL发行版的Codex目标")
 
+        self._save_wsl_cache(wsl_mtime, targets)
         return targets
 
     def _build_wsl_windows_path(self, distro: str, linux_file: str) -> Path:
@@ -286,13 +1004,9 @@ class FloatingMonitor(QMainWindow):
         chosen_root: Optional[Path] = None
 
         for root in preferred_roots:
-            base = root / distro
-            try:
-                if base.exists():
-                    chosen_root = root
-                    break
-            except OSError:
-                continue
+            if distro in _list_dir_names(str(root)):
+                chosen_root = root
+                break
 
         if chosen_root is None:
             chosen_root = preferred_roots[0]
@@ -329,7 +1043,7 @@ class FloatingMonitor(QMainWindow):
             return ""
 
         try:
-            settings = json.loads(stdout)
+            settings = _json_loads(stdout)
             return settings.get('OPENAI_API_KEY', '')
         except json.JSONDecodeError as e:
             self.logger.error(f"解析WSL Codex配置失败({distro}): {e}")
@@ -363,25 +1077,24 @@ class FloatingMonitor(QMainWindow):
 
         return stdout.replace('\x00', '').strip()
 
-    def _load_current_openai_key(self) -> str:
+    def _load_current_openai_key(self, local_paths: List[Path],
+                                 wsl_targets: List[Dict[str, Any]]) -> str:
         """从Codex配置文件加载当前OpenAI Key"""
         # 尝试本地 Windows 路径
-        for path in getattr(self, "local_codex_paths", []):
+        for path in local_paths:
             try:
-                if not path.exists():
-                    continue
-
-                with open(path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    key = settings.get('OPENAI_API_KEY', '')
-                    if key:
-                        self.logger.info(f"从Codex配置加载OpenAI Key: {key[:15]}...")
-                        return key
+                settings = self._read_json_cached(path)
+                key = settings.get('OPENAI_API_KEY', '')
+                if key:
+                    self.logger.info(f"从Codex配置加载OpenAI Key: {key[:15]}...")
+                    return key
+            except FileNotFoundError:
+                continue
             except Exception as e:
                 self.logger.debug(f"读取Codex配置失败({path}): {e}")
 
         # 尝试通过 WSL 读取
-        for target in getattr(self, "wsl_targets", []):
+        for target in wsl_targets:
             key = self._read_openai_key_from_wsl(target)
             if key:
                 self.logger.info(
@@ -397,18 +1110,24 @@ class FloatingMonitor(QMainWindow):
     def _save_token_to_claude_settings(self, token: str) -> bool:
         """保存Token到Claude配置文件"""
         try:
-            # 确保目录存在
-            self.claude_settings_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # 读取现有配置
+            # 读取现有配置（直接读取，文件不存在时再创建目录，省去单独的存在性检查）
             settings = {}
-            if self.claude_settings_path.exists():
-                try:
-                    with open(self.claude_settings_path, 'r', encoding='utf-8') as f:
-                        settings = json.load(f)
-                except json.JSONDecodeError:
-                    self.logger.warning("现有配置文件格式错误，将创建新配置")
-                    settings = {}
+            try:
+                cached = self._read_json_cached(self.claude_settings_path)
+                env = cached.get('env')
+                if isinstance(env, dict) and env.get('ANTHROPIC_AUTH_TOKEN') == token:
+                    # 配置中已是该Token，无需重写文件
+                    self.logger.info(f"Claude配置Token未变化，跳过写入: {self.claude_settings_path}")
+                    return True
+                # 缓存的解析结果不可修改：只复制需要改动的顶层与 env 两层，其余子结构与缓存共享
+                settings = dict(cached)
+                if isinstance(env, dict):
+                    settings['env'] = dict(env)
+            except FileNotFoundError:
+                self.claude_settings_path.parent.mkdir(parents=True, exist_ok=True)
+            except json.JSONDecodeError:
+                self.logger.warning("现有配置文件格式错误，将创建新配置")
+                settings = {}
 
             # 确保env字段存在
             if 'env' not in settings:
@@ -418,8 +1137,7 @@ class FloatingMonitor(QMainWindow):
             settings['env']['ANTHROPIC_AUTH_TOKEN'] = token
 
             # 保存配置
-            with open(self.claude_settings_path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=2, ensure_ascii=False)
+            self._write_json_atomic(self.claude_settings_path, settings)
 
             self.logger.info(f"成功保存Token到Claude配置文件: {self.claude_settings_path}")
             return True
@@ -432,25 +1150,27 @@ class FloatingMonitor(QMainWindow):
         """保存OpenAI Key到Codex配置文件"""
         path = target_path or self.codex_auth_path
         try:
-            # 确保目录存在
-            path.parent.mkdir(parents=True, exist_ok=True)
-
-            # 读取现有配置
+            # 读取现有配置（直接读取，文件不存在时再创建目录，省去单独的存在性检查）
             settings = {}
-            if path.exists():
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        settings = json.load(f)
-                except json.JSONDecodeError:
-                    self.logger.warning("Codex配置文件格式错误，将创建新配置")
-                    settings = {}
+            try:
+                cached = self._read_json_cached(path)
+                if cached.get('OPENAI_API_KEY') == token:
+                    # 配置中已是该Key，无需重写文件
+                    self.logger.info(f"Codex配置Key未变化，跳过写入: {path}")
+                    return True, ""
+                # 只改动顶层字段，浅拷贝即可保证缓存的解析结果不被修改
+                settings = dict(cached)
+            except FileNotFoundError:
+                path.parent.mkdir(parents=True, exist_ok=True)
+            except json.JSONDecodeError:
+                self.logger.warning("Codex配置文件格式错误，将创建新配置")
+                settings = {}
 
             # 更新Key
             settings['OPENAI_API_KEY'] = token
 
             # 保存配置
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=2, ensure_ascii=False)
+            self._write_json_atomic(path, settings)
 
             self.logger.info(f"成功保存OpenAI Key到Codex配置文件: {path}")
             return True, ""
@@ -467,7 +1187,7 @@ class FloatingMonitor(QMainWindow):
         if not distro or not home_path or not linux_path:
             return False, "WSL 目标信息不完整"
 
-        json_content = json.dumps({'OPENAI_API_KEY': token}, ensure_ascii=False, indent=2)
+        json_content = _json_dumps({'OPENAI_API_KEY': token}).decode('utf-8')
         linux_dir = home_path.rstrip('/') + "/.codex"
 
         script = (
@@ -512,6 +1232,18 @@ class FloatingMonitor(QMainWindow):
         self.expanded_size = (320, 200)  # 大幅缩小高度
         self.setFixedSize(*self.expanded_size)
 
+        # 两种状态的 QSize 构造一次，悬停事件中直接与 size() 比较
+        self._collapsed_qsize = QSize(*self.collapsed_size)
+        self._expanded_qsize = QSize(*self.expanded_size)
+
+        # 光晕各层的 (半径, 画刷)，由收缩尺寸一次算出
+        base_radius = self.collapsed_size[0] // 2 - 2
+        self._glow_layers = tuple(
+            (base_radius + radius_offset, brush) for radius_offset, brush in _GLOW_LAYERS
+        )
+        # 光晕外接正方形半边长（四周各留1像素容纳抗锯齿边缘），同样只与收缩尺寸有关
+        self._glow_half_side = self._glow_layers[-1][0] + 1
+
         # 存储总余额用于收缩态显示
         self.current_total_balance = 0.0
 
@@ -535,6 +1267,7 @@ class FloatingMonitor(QMainWindow):
         # 创建内容区域
         self.content_widget = QWidget()
         self.content_widget.setObjectName("content")
+        self.content_widget.setProperty("state", "expanded")
         main_layout.addWidget(self.content_widget)
 
         # 内容布局 - 减小边距和间距
@@ -543,123 +1276,12 @@ class FloatingMonitor(QMainWindow):
         layout.setSpacing(4)  # 8→4 节省高度
 
         # 设置紧凑版样式
-        self.setStyleSheet("""
-            #content {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(20, 20, 30, 230),
-                    stop:1 rgba(30, 30, 45, 230));
-                border-radius: 20px;
-                border: 1px solid rgba(100, 100, 255, 0.2);
-            }
-            #content:hover {
-                border: 1px solid rgba(150, 150, 255, 0.4);
-            }
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #5555ff,
-                    stop:1 #8855ff);
-                border: none;
-                border-radius: 12px;
-                color: white;
-                font-size: 11px;
-                font-weight: bold;
-                padding: 4px 8px;
-                min-height: 18px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #6666ff,
-                    stop:1 #9966ff);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #4444ee,
-                    stop:1 #7744ee);
-            }
-            QTableWidget {
-                background: rgba(20, 20, 30, 100);
-                border: 1px solid rgba(100, 100, 255, 0.1);
-                border-radius: 6px;
-                color: #e0e0e0;
-                gridline-color: rgba(100, 100, 255, 0.05);
-                selection-background-color: rgba(100, 100, 255, 0.3);
-            }
-            QTableWidget::item {
-                padding: 2px;
-                border: none;
-            }
-            QTableWidget::item:selected {
-                background: rgba(100, 100, 255, 0.3);
-            }
-            QHeaderView::section {
-                background: rgba(40, 40, 60, 180);
-                color: #c0c0ff;
-                border: none;
-                padding: 2px;
-                font-size: 10px;
-                font-weight: bold;
-            }
-            QTextEdit {
-                background: rgba(15, 15, 25, 80);
-                border: none;
-                color: #a0a0d0;
-                font-size: 8px;
-                padding: 2px;
-                line-height: 1.3;
-            }
-            QScrollBar:vertical {
-                background: rgba(20, 20, 30, 50);
-                width: 6px;
-                border-radius: 3px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(100, 100, 255, 0.3);
-                border-radius: 3px;
-                min-height: 15px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(100, 100, 255, 0.5);
-            }
-            QScrollBar::add-line:vertical,
-            QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QLabel {
-                color: #a0a0c0;
-                background: transparent;
-            }
-            QMenu {
-                background: rgba(25, 25, 35, 240);
-                border: 1px solid rgba(100, 100, 255, 0.2);
-                border-radius: 6px;
-            }
-            QMenu::item {
-                color: #e0e0e0;
-                padding: 5px 15px;
-                border-radius: 3px;
-                margin: 2px 3px;
-            }
-            QMenu::item:selected {
-                background: rgba(100, 100, 255, 0.3);
-            }
-            QMenu::separator {
-                height: 1px;
-                background: rgba(100, 100, 255, 0.1);
-                margin: 3px 6px;
-            }
-        """)
+        self.setStyleSheet(_MAIN_STYLESHEET)
 
         # 创建收缩状态的标签 - 显示总余额
         self.collapsed_label = QLabel("$0")
         self.collapsed_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.collapsed_label.setStyleSheet("""
-            QLabel {
-                color: #e0e0ff;
-                font-size: 13px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
+        self.collapsed_label.setStyleSheet(_COLLAPSED_LABEL_STYLESHEET)
         self.collapsed_label.hide()
         layout.addWidget(self.collapsed_label)
 
@@ -675,37 +1297,14 @@ class FloatingMonitor(QMainWindow):
         self.quit_btn = QPushButton("退出")
         self.quit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.quit_btn.clicked.connect(self.force_quit)
-        self.quit_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #ff5555,
-                    stop:1 #ff8855);
-                border: none;
-                border-radius: 12px;
-                color: white;
-                font-size: 10px;
-                font-weight: bold;
-                padding: 4px 8px;
-                min-height: 18px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #ff6666,
-                    stop:1 #ff9966);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #ee4444,
-                    stop:1 #ee7744);
-            }
-        """)
+        self.quit_btn.setStyleSheet(_QUIT_BTN_STYLESHEET)
         btn_layout.addWidget(self.quit_btn)
 
         layout.addLayout(btn_layout)
 
         # 环境变量状态显示 - 精简
         self.env_label = QLabel("Claude: 检测中... | OpenAI: 检测中...")
-        self.env_label.setStyleSheet("font-size: 8px; color: #7070a0; padding: 1px;")
+        self.env_label.setObjectName("env")
         layout.addWidget(self.env_label)
 
         # 表格 - 固定高度只显示3行
@@ -714,6 +1313,7 @@ class FloatingMonitor(QMainWindow):
         self.table.setHorizontalHeaderLabels(["用户", "余额", "状态"])
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
+        self._init_context_menu()
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
 
@@ -733,9 +1333,12 @@ class FloatingMonitor(QMainWindow):
         layout.addWidget(self.table)
 
         # 创建进度文本框（初始隐藏）- 同样限制高度
-        self.progress_text = QTextEdit()
+        self.progress_text = QPlainTextEdit()
         self.progress_text.setReadOnly(True)
         self.progress_text.setPlaceholderText("查询进度...")
+        # 限制日志行数，超出后由Qt自动丢弃最早的行
+        self.progress_text.setMaximumBlockCount(PROGRESS_MAX_BLOCKS)
+        self.progress_text.setUndoRedoEnabled(False)
         self.progress_text.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.progress_text.setMaximumHeight(72)
         self.progress_text.setMinimumHeight(72)
@@ -751,36 +1354,25 @@ class FloatingMonitor(QMainWindow):
         self.toggle_btn.setMaximumWidth(50)
         self.toggle_btn.setMaximumHeight(16)
         self.toggle_btn.clicked.connect(self.toggle_progress)
-        self.toggle_btn.setStyleSheet("""
-            QPushButton {
-                background: rgba(60, 60, 80, 100);
-                border: none;
-                border-radius: 3px;
-                color: #a0a0c0;
-                font-size: 8px;
-                padding: 1px 3px;
-            }
-            QPushButton:hover {
-                background: rgba(80, 80, 100, 150);
-            }
-        """)
+        self.toggle_btn.setStyleSheet(_TOGGLE_BTN_STYLESHEET)
         bottom_layout.addWidget(self.toggle_btn)
 
         # 总余额显示
         self.total_label = QLabel("总余额: --")
-        self.total_label.setStyleSheet("""
-            font-size: 10px;
-            color: #90d090;
-            padding: 2px;
-            font-weight: bold;
-        """)
+        self.total_label.setStyleSheet(_TOTAL_LABEL_STYLESHEET)
         self.total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         bottom_layout.addWidget(self.total_label)
 
         layout.addLayout(bottom_layout)
 
+        # 展开状态可见的控件（收缩时统一隐藏）
+        self._expand_visible_children = (
+            self.btn, self.env_label, self.table,
+            self.toggle_btn, self.total_label, self.quit_btn
+        )
+
         # 设置初始位置（右侧中央偏下）
-        screen = QApplication.primaryScreen().availableGeometry()
+        screen = self._avail_geom
         initial_x = screen.width() - 80
         initial_y = screen.height() // 2 + 100
         self.move(initial_x, initial_y)
@@ -791,24 +1383,41 @@ class FloatingMonitor(QMainWindow):
             initial_y + self.collapsed_size[1] // 2
         )
 
-    def _build_account_display_name(self, account: Account) -> str:
-        """构造账号显示名称，附带状态标记"""
-        markers: List[str] = []
-        if account.api_key and account.api_key == self.current_env_token:
-            markers.append("●")
-        if account.api_key and account.api_key == self.current_openai_key:
-            markers.append("◎")
-
-        if markers:
-            return f"{''.join(markers)} {account.username}"
-        return account.username
+    def _rebuild_account_index(self):
+        """重建 用户名->行号 与 API Key->用户名 索引（账号列表变化时调用）"""
+        accounts = self.config.accounts
+        # 三个索引在同一次遍历中建立
+        username_to_row: Dict[str, int] = {}
+        key_to_username: Dict[str, str] = {}
+        key_to_rows: Dict[str, List[int]] = {}
+        for i, account in enumerate(accounts):
+            username_to_row[account.username] = i
+            if account.api_key:
+                # 与原线性查找一致：重复Key取第一个账号
+                key_to_username.setdefault(account.api_key, account.username)
+                key_to_rows.setdefault(account.api_key, []).append(i)
+        self._username_to_row = username_to_row
+        self._key_to_username = key_to_username
+        self._key_to_rows = key_to_rows
+        self._indexed_usernames = tuple(account.username for account in accounts)
+        # 各行带标记的显示名称预先生成（按 (是否Claude当前Token, 是否OpenAI当前Key) 取用），切换时无需拼接
+        self._row_name_variants = [
+            {flags: prefix + account.username for flags, prefix in _DISPLAY_MARKER_PREFIX.items()}
+            for account in accounts
+        ]
+
+    def _current_display_names(self) -> List[str]:
+        """按当前Token/Key从预生成的变体中取出各行显示名称（行顺序与账号列表一致）"""
+        env_token, openai_key = self.current_env_token, self.current_openai_key
+        return [
+            variants[(account.api_key == env_token, account.api_key == openai_key)]
+            if account.api_key else variants[(False, False)]
+            for account, variants in zip(self.config.accounts, self._row_name_variants)
+        ]
 
     def _find_username_by_key(self, key: str) -> str:
         """根据API Key查找用户名"""
-        for account in self.config.accounts:
-            if account.api_key == key:
-                return account.username
-        return "未知"
+        return self._key_to_username.get(key, "未知")
 
     def load_accounts(self):
         """加载账号列表"""
@@ -821,36 +1430,79 @@ class FloatingMonitor(QMainWindow):
 
             cached_balances = self.service.get_cached_balances()
             cache_hit_count = 0
-            latest_cache_time = ""
+            cache_times: List[str] = []
 
-            self.table.setRowCount(len(accounts))
-
-            for i, account in enumerate(accounts):
-                display_name = self._build_account_display_name(account)
-                self.table.setItem(i, 0, QTableWidgetItem(display_name))
+            # 先按当前账号列表建立索引与显示名称变体
+            self._rebuild_account_index()
+            display_names = self._current_display_names()
 
+            # 先计算全部单元格内容 (用户, 余额, 状态, 状态画刷)，再在禁用刷新的情况下批量写入表格
+            cells: List[Tuple[str, str, str, Optional[QBrush]]] = []
+            values: List[Optional[float]] = []
+            statuses: List[str] = []
+            for account, display_name in zip(accounts, display_names):
                 cache_item = cached_balances.get(account.username, {})
                 cached_balance = str(cache_item.get("balance", "")).strip()
                 cached_at = str(cache_item.get("updated_at", "")).strip()
 
                 if cached_balance:
                     cache_hit_count += 1
-                    if cached_at and cached_at > latest_cache_time:
-                        latest_cache_time = cached_at
+                    if cached_at:
+                        cache_times.append(cached_at)
 
-                    self.table.setItem(i, 1, QTableWidgetItem(cached_balance))
-                    status_item = QTableWidgetItem("缓存")
-                    status_item.setForeground(QColor("#ffcc66"))
-                    self.table.setItem(i, 2, status_item)
+                    cells.append((display_name, cached_balance, "缓存", _STATUS_CACHE_BRUSH))
+                    values.append(_parse_balance(cached_balance))
+                    statuses.append("缓存")
                 else:
-                    self.table.setItem(i, 1, QTableWidgetItem("等待"))
-                    self.table.setItem(i, 2, QTableWidgetItem("待机"))
+                    cells.append((display_name, "等待", "待机", None))
+                    values.append(None)
+                    statuses.append("待机")
+
+            sorting_enabled = self.table.isSortingEnabled()
+            self.table.setUpdatesEnabled(False)
+            self.table.blockSignals(True)
+            self.table.setSortingEnabled(False)
+            try:
+                self.table.setRowCount(len(cells))
+                name_items: List[QTableWidgetItem] = []
+                balance_items: List[QTableWidgetItem] = []
+                status_items: List[QTableWidgetItem] = []
+                for i, (name, balance, status, brush) in enumerate(cells):
+                    name_item = QTableWidgetItem(name)
+                    balance_item = QTableWidgetItem(balance)
+                    status_item = QTableWidgetItem(status)
+                    if brush is not None:
+                        status_item.setForeground(brush)
+                    self.table.setItem(i, 0, name_item)
+                    self.table.setItem(i, 1, balance_item)
+                    self.table.setItem(i, 2, status_item)
+                    name_items.append(name_item)
+                    balance_items.append(balance_item)
+                    status_items.append(status_item)
+                self._name_items = name_items
+                self._balance_items = balance_items
+                self._status_items = status_items
+                self._row_values = [None] * len(values)
+                self._row_statuses = statuses
+                # 显示名称已在 cells 中，无需再按用户名逐个查表
+                self._row_display_names = [cell[0] for cell in cells]
+                self._marked_pair = (self.current_env_token, self.current_openai_key)
+                self._values_total = 0.0
+                self._values_count = 0
+                for i, value in enumerate(values):
+                    self._set_row_value(i, value)
+            finally:
+                self.table.setSortingEnabled(sorting_enabled)
+                self.table.blockSignals(False)
+                self.table.setUpdatesEnabled(True)
 
             # 更新环境变量状态显示
             self.update_env_status_display()
-            self.update_total_balance()
+            self._total_update_timer.start()
 
             if cache_hit_count > 0:
+                # ISO-8601 时间字符串可直接按字典序比较，循环结束后一次性取最大值
+                latest_cache_time = max(cache_times, default="")
                 if latest_cache_time:
                     self.add_progress(f"已加载 {cache_hit_count} 个账号缓存余额（更新时间: {latest_cache_time}）")
                 else:
@@ -878,37 +1530,60 @@ class FloatingMonitor(QMainWindow):
                 # 切换到进度视图
                 self.progress_text.show()
                 self.table.hide()
+                self._flush_progress()
                 self.toggle_btn.setText("▲账号")
                 self.logger.debug("切换到进度视图")
         except Exception as e:
             self.logger.error(f"切换视图失败: {e}")
 
     def add_progress(self, message: str):
-        """添加进度信息"""
+        """添加进度信息（先缓冲，由计时器合并写入）"""
         try:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.progress_text.append(f"[{timestamp}] {message}")
-            # 自动滚动到底部
-            cursor = self.progress_text.textCursor()
-            cursor.movePosition(cursor.MoveOperation.End)
-            self.progress_text.setTextCursor(cursor)
+            self._pending_progress.append("[%s] %s" % (_timestamp(), message))
+            if not self._progress_flush_timer.isActive():
+                self._progress_flush_timer.start()
         except Exception as e:
             self.logger.error(f"添加进度信息失败: {e}")
 
-    def update_progress(self, username: str, message: str):
-        """更新查询进度"""
+    def add_progress_lines(self, messages: List[str]):
+        """批量添加进度信息，共用同一时间戳并只触发一次合并写入"""
+        if not messages:
+            return
+
         try:
-            self.add_progress(f"{username}: {message}")
+            prefix = "[%s] " % _timestamp()
+            self._pending_progress.extend(prefix + message for message in messages)
+            if not self._progress_flush_timer.isActive():
+                self._progress_flush_timer.start()
         except Exception as e:
-            self.logger.error(f"更新进度失败: {e}")
+            self.logger.error(f"添加进度信息失败: {e}")
+
+    def _flush_progress(self):
+        """将缓冲的进度信息一次性写入文本框"""
+        pending = self._pending_progress
+        if not pending:
+            return
+
+        if not self.progress_text.isVisible():
+            # 进度视图未显示时暂不写入文本框，只保留文本框能容纳的最近若干条，切换到进度视图时再写入
+            if len(pending) > PROGRESS_MAX_BLOCKS:
+                del pending[:-PROGRESS_MAX_BLOCKS]
+            return
+
+        try:
+            # 纯文本追加，滚动条位于底部时自动跟随
+            self.progress_text.appendPlainText("\n".join(self._pending_progress))
+            self._pending_progress.clear()
+        except Exception as e:
+            self.logger.error(f"写入进度信息失败: {e}")
 
     def copy_total_balance(self):
         """复制总余额到剪贴板"""
         try:
-            clipboard = QApplication.clipboard()
+            # 防抖刷新可能尚未执行，先同步合计（无变化时直接返回）
+            self.update_total_balance()
             balance_text = f"${self.current_total_balance:.2f}"
-            clipboard.setText(balance_text)
+            self._set_clipboard_text(balance_text)
             self.logger.info(f"已复制总余额: {balance_text}")
             self.add_progress(f"已复制总余额到剪贴板: {balance_text}")
         except Exception as e:
@@ -917,17 +1592,41 @@ class FloatingMonitor(QMainWindow):
 
     def update_env_status_display(self):
         """更新Claude配置状态显示 - 精简版"""
-        claude_user = "未设置"
-        if self.current_env_token:
-            claude_user = self._find_username_by_key(self.current_env_token)
+        if not self._external_config_loaded:
+            # 外部配置仍在后台加载，保留"检测中..."占位文本
+            return
 
-        openai_user = "未设置"
-        if self.current_openai_key:
-            openai_user = self._find_username_by_key(self.current_openai_key)
+        env_token = self.current_env_token
+        openai_key = self.current_openai_key
+        claude_user = self._find_username_by_key(env_token) if env_token else "未设置"
+        openai_user = self._find_username_by_key(openai_key) if openai_key else "未设置"
 
-        env_text = f"Claude: {claude_user} | OpenAI: {openai_user}"
+        env_text = "Claude: %s | OpenAI: %s" % (claude_user, openai_user)
         self.env_label.setText(env_text)
 
+    def _init_context_menu(self):
+        """创建账号右键菜单（只创建一次，弹出时按行更新文本与可用状态）"""
+        self._ctx_account: Optional[Account] = None
+        self._ctx_menu = QMenu(self)
+
+        # 复制API Key选项
+        self._ctx_copy_action = QAction(self)
+        self._ctx_copy_action.triggered.connect(self._on_ctx_copy_apikey)
+        self._ctx_menu.addAction(self._ctx_copy_action)
+
+        # 分隔线
+        self._ctx_menu.addSeparator()
+
+        # 设置Claude配置选项
+        self._ctx_env_action = QAction(self)
+        self._ctx_env_action.triggered.connect(self._on_ctx_set_env_token)
+        self._ctx_menu.addAction(self._ctx_env_action)
+
+        # 设置OpenAI配置选项
+        self._ctx_openai_action = QAction(self)
+        self._ctx_openai_action.triggered.connect(self._on_ctx_set_openai_key)
+        self._ctx_menu.addAction(self._ctx_openai_action)
+
     def show_context_menu(self, position):
         """显示右键菜单"""
         item = self.table.itemAt(position)
@@ -935,72 +1634,75 @@ class FloatingMonitor(QMainWindow):
             return
 
         row = item.row()
-        if row >= len(self.config.accounts):
+        accounts = self.config.accounts
+        if row >= len(accounts):
             return
 
         # 获取账号信息
-        account = self.config.accounts[row]
-        username = account.username
-        apikey = account.api_key if account.api_key else ""
-
+        account = accounts[row]
+        apikey = account.api_key
         if not apikey:
             return
 
-        # 创建右键菜单
-        menu = QMenu(self)
-
-        # 复制API Key选项
-        copy_action = QAction(f"复制 {username} 的API Key", self)
-        copy_action.triggered.connect(lambda checked=False, key=apikey: self.copy_apikey(key))
-        menu.addAction(copy_action)
-
-        # 分隔线
-        menu.addSeparator()
-
-        # 设置Claude配置选项
-        is_current = apikey == self.current_env_token
-        if is_current:
-            env_action = QAction(f"● 当前Claude配置", self)
-            env_action.setEnabled(False)  # 禁用，只用于显示状态
-        else:
-            env_action = QAction(f"设为Claude配置Token", self)
-            env_action.triggered.connect(
-                lambda checked=False, name=username, key=apikey: self.set_env_token(name, key)
-            )
-
-        menu.addAction(env_action)
+        self._ctx_account = account
+        self._ctx_copy_action.setText(f"复制 {account.username} 的API Key")
 
-        # 设置OpenAI配置选项
-        is_openai_current = apikey == self.current_openai_key
-        if is_openai_current:
-            openai_action = QAction("◎ 当前OpenAI配置", self)
-            openai_action.setEnabled(False)
-        else:
-            openai_action = QAction("设为OpenAI配置Key", self)
-            openai_action.triggered.connect(
-                lambda checked=False, name=username, key=apikey: self.set_openai_key(name, key)
-            )
+        # 当前配置项禁用，只用于显示状态
+        # 按 Key->行号 索引判断，与当前Token/Key相同的行已在索引中
+        key_to_rows = self._key_to_rows
+        is_current = row in key_to_rows.get(self.current_env_token, ())
+        self._ctx_env_action.setText("● 当前Claude配置" if is_current else "设为Claude配置Token")
+        self._ctx_env_action.setEnabled(not is_current)
 
-        menu.addAction(openai_action)
+        is_openai_current = row in key_to_rows.get(self.current_openai_key, ())
+        self._ctx_openai_action.setText("◎ 当前OpenAI配置" if is_openai_current else "设为OpenAI配置Key")
+        self._ctx_openai_action.setEnabled(not is_openai_current)
 
         # 显示菜单
-        menu.exec(self.table.mapToGlobal(position))
+        self._ctx_menu.exec(self.table.mapToGlobal(position))
+
+    def _on_ctx_copy_apikey(self):
+        """右键菜单: 复制API Key"""
+        if self._ctx_account is not None:
+            self.copy_apikey(self._ctx_account.api_key)
+
+    def _on_ctx_set_env_token(self):
+        """右键菜单: 设为Claude配置Token"""
+        account = self._ctx_account
+        if account is not None:
+            self.set_env_token(account.username, account.api_key)
+
+    def _on_ctx_set_openai_key(self):
+        """右键菜单: 设为OpenAI配置Key"""
+        account = self._ctx_account
+        if account is not None:
+            self.set_openai_key(account.username, account.api_key)
+
+    def _set_clipboard_text(self, text: str):
+        """写入剪贴板（延后到事件循环执行，避免剪贴板管理器响应慢时阻塞菜单关闭）"""
+        clipboard = self._clipboard
+        QTimer.singleShot(0, partial(clipboard.setText, text))
 
     def copy_apikey(self, apikey):
         """复制API key到剪贴板"""
-        clipboard = QApplication.clipboard()
-        clipboard.setText(apikey)
+        self._set_clipboard_text(apikey)
         self.logger.info(f"已复制API Key: {apikey[:20]}...")
 
     def set_env_token(self, username, apikey):
         """设置Claude配置文件中的Token"""
+        # 已是当前Token时直接返回，省去一次配置文件读写
+        if apikey == self.current_env_token:
+            self.add_progress(f"- {username} 已是当前Claude配置Token")
+            return True
+
         try:
             self.logger.info(f"正在为 {username} 设置Claude配置Token...")
 
             # 保存到Claude配置文件
             if self._save_token_to_claude_settings(apikey):
-                # 更新当前Token
+                # 更新当前Token（后台加载中的旧值不再覆盖）
                 self.current_env_token = apikey
+                self._token_generation += 1
 
                 # 刷新显示
                 self.refresh_user_display()
@@ -1038,41 +1740,63 @@ class FloatingMonitor(QMainWindow):
         try:
             self.logger.info(f"正在为 {username} 设置OpenAI配置Key...")
 
-            # 每次操作前重新解析路径，确保捕获最新环境
-            self.codex_auth_path = self._resolve_codex_auth_path()
-
-            wsl_targets = getattr(self, "wsl_targets", [])
+            # 每次操作前重新解析路径，确保捕获最新环境（同时刷新WSL缓存）；
+            # 后台加载中的旧路径与Key不再覆盖
+            self.codex_auth_path, local_paths, wsl_targets = self._resolve_codex_auth_path(refresh_wsl=True)
+            self.local_codex_paths = local_paths
+            self.wsl_targets = wsl_targets
+            self._openai_key_generation += 1
             self.logger.debug(
                 "WSL 目标数量: %d", len(wsl_targets)
             )
             if wsl_targets:
+                if len(wsl_targets) > 1:
+                    distros = sorted({t.get('distro', '?') for t in wsl_targets})
+                else:
+                    distros = [wsl_targets[0].get('distro', '?')]
                 self.add_progress(
-                    f"检测到 {len(wsl_targets)} 个WSL目标: "
-                    + ", ".join(sorted({t.get('distro', '?') for t in wsl_targets}))
+                    f"检测到 {len(wsl_targets)} 个WSL目标: " + ", ".join(distros)
                 )
             else:
                 self.add_progress("未检测到可写入的WSL目标，将仅写入Windows路径")
 
-            results: List[Dict[str, Any]] = []
-
-            for path in getattr(self, "local_codex_paths", []):
-                success, error = self._save_openai_key_to_codex_auth(apikey, path)
-                results.append({
-                    "success": success,
-                    "label": f"Windows路径: {path}",
-                    "error": error,
-                    "path": str(path)
-                })
+            # 写入任务: (标签, 路径, 写入函数)
+            tasks: List[Tuple[str, str, Any]] = []
+
+            for path in local_paths:
+                tasks.append((
+                    f"Windows路径: {path}",
+                    str(path),
+                    partial(self._save_openai_key_to_codex_auth, apikey, path)
+                ))
+
+            for target in wsl_targets:
+                tasks.append((
+                    f"WSL[{target.get('distro', 'unknown')}]: {target.get('linux_path', '')}",
+                    target.get('linux_path', ''),
+                    partial(self._save_openai_key_to_wsl, target, apikey)
+                ))
+
+            # 各目标相互独立，并行写入（WSL写入需启动 wsl.exe，串行时耗时叠加）
+            outcomes: List[Tuple[bool, str]] = []
+            if tasks:
+                with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+                    futures = [executor.submit(fn) for _, _, fn in tasks]
+                for future in futures:
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        outcomes.append((False, str(e)))
 
-            for target in getattr(self, "wsl_targets", []):
-                success, error = self._save_openai_key_to_wsl(target, apikey)
-                label = f"WSL[{target.get('distro', 'unknown')}]: {target.get('linux_path', '')}"
-                results.append({
+            results: List[Dict[str, Any]] = [
+                {
                     "success": success,
                     "label": label,
                     "error": error,
-                    "path": target.get('linux_path', '')
-                })
+                    "path": path
+                }
+                for (label, path, _), (success, error) in zip(tasks, outcomes)
+            ]
 
             if not results:
                 QMessageBox.warning(
@@ -1093,6 +1817,7 @@ class FloatingMonitor(QMainWindow):
             ]
 
             summary_parts = []
+            progress_lines = []
             for item in results:
                 symbol = "✓" if item['success'] else "✗"
                 line = f"{symbol} {item['label']}"
@@ -1103,7 +1828,8 @@ class FloatingMonitor(QMainWindow):
                 progress_line = f"{symbol} {item['label']}"
                 if item['error']:
                     progress_line += f" | 原因: {item['error']}"
-                self.add_progress(progress_line)
+                progress_lines.append(progress_line)
+            self.add_progress_lines(progress_lines)
 
             message_text = "\n".join(message_lines)
 
@@ -1140,18 +1866,68 @@ class FloatingMonitor(QMainWindow):
 
     def refresh_user_display(self):
         """刷新用户显示，更新环境变量标记"""
-        for i, account in enumerate(self.config.accounts):
-            item = self.table.item(i, 0)
-            if item is None:
-                item = QTableWidgetItem()
-                self.table.setItem(i, 0, item)
-            item.setText(self._build_account_display_name(account))
-
-    def _show_closing_dialog(self):
-        """显示退出动画对话框 - 在软件窗口正中央"""
-        from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QTextEdit
-        from PyQt6.QtCore import Qt, QTimer
+        accounts = self.config.accounts
+        token_pair = (self.current_env_token, self.current_openai_key)
+        marked_pair = self._marked_pair
+        # 账号列表变化（按用户名序列判断，而非仅比较数量）时重建索引并全部重写
+        if tuple(account.username for account in accounts) != self._indexed_usernames:
+            self._rebuild_account_index()
+            marked_pair = None
+        row_display_names = self._row_display_names
+        if len(row_display_names) != len(accounts):
+            row_display_names = self._row_display_names = [""] * len(accounts)
+            marked_pair = None
+
+        if marked_pair is not None:
+            # 标记只可能出现在新旧Token/Key对应的行上，按Key索引只检查这些行
+            rows = sorted({
+                i
+                for key in marked_pair + token_pair if key
+                for i in self._key_to_rows.get(key, ())
+            })
+            env_token, openai_key = token_pair
+            variants = self._row_name_variants
+            changed = []
+            for i in rows:
+                api_key = accounts[i].api_key
+                text = variants[i][(api_key == env_token, api_key == openai_key)]
+                if row_display_names[i] != text:
+                    changed.append((i, text))
+        else:
+            changed = [
+                (i, text)
+                for i, text in enumerate(self._current_display_names())
+                if row_display_names[i] != text or self.table.item(i, 0) is None
+            ]
+        self._marked_pair = token_pair
+        if not changed:
+            return
 
+        # 变化行较多（如重建索引后全部重写）时暂停重绘与信号，写完统一刷新一次
+        batch = len(changed) > _DISPLAY_BATCH_THRESHOLD
+        if batch:
+            self.table.setUpdatesEnabled(False)
+            self.table.blockSignals(True)
+        try:
+            # 单元格 setText 只通知该格数据变化，视图仅重绘对应区域
+            name_items = self._name_items
+            for i, text in changed:
+                if i < len(name_items):
+                    name_items[i].setText(text)
+                else:
+                    item = self.table.item(i, 0)
+                    if item is None:
+                        self.table.setItem(i, 0, QTableWidgetItem(text))
+                    else:
+                        item.setText(text)
+                row_display_names[i] = text
+        finally:
+            if batch:
+                self.table.blockSignals(False)
+                self.table.setUpdatesEnabled(True)
+
+    def _build_closing_dialog(self) -> QDialog:
+        """构造退出动画对话框（只构造一次，之后复用）"""
         # 创建对话框 - 紧凑尺寸
         dialog = QDialog(self)
         dialog.setWindowTitle("正在退出")
@@ -1166,32 +1942,7 @@ class FloatingMonitor(QMainWindow):
         )
 
         # 设置样式 - 紧凑版本
-        dialog.setStyleSheet("""
-            QDialog {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(25, 25, 35, 245),
-                    stop:1 rgba(35, 35, 50, 245));
-                border-radius: 12px;
-                border: 2px solid rgba(120, 120, 255, 0.5);
-            }
-            QLabel#title {
-                color: #e0e0ff;
-                font-size: 12px;
-                font-weight: bold;
-                background: transparent;
-                padding: 4px;
-            }
-            QTextEdit {
-                background: rgba(15, 15, 25, 150);
-                border: 1px solid rgba(80, 80, 120, 0.3);
-                border-radius: 6px;
-                color: #b0b0e0;
-                font-size: 8px;
-                font-family: 'Consolas', 'Monaco', monospace;
-                padding: 4px;
-                line-height: 1.2;
-            }
-        """)
+        dialog.setStyleSheet(_CLOSING_DIALOG_STYLESHEET)
 
         layout = QVBoxLayout(dialog)
         layout.setContentsMargins(12, 10, 12, 10)  # 减小内边距
@@ -1204,8 +1955,10 @@ class FloatingMonitor(QMainWindow):
         layout.addWidget(title_label)
 
         # 进度显示文本框
-        progress_text = QTextEdit()
+        progress_text = QPlainTextEdit()
         progress_text.setReadOnly(True)
+        progress_text.setUndoRedoEnabled(False)
+        progress_text.setMaximumBlockCount(_CLEANUP_MAX_BLOCKS)
         progress_text.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         progress_text.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         layout.addWidget(progress_text)
@@ -1213,6 +1966,18 @@ class FloatingMonitor(QMainWindow):
         # 保存对话框引用
         self.cleanup_dialog = dialog
         self.cleanup_progress_text = progress_text
+        return dialog
+
+    def _show_closing_dialog(self):
+        """显示退出动画对话框 - 在软件窗口正中央"""
+        dialog = self.cleanup_dialog
+        if dialog is None:
+            dialog = self._build_closing_dialog()
+        elif dialog.isVisible():
+            # 清理流程已在进行中
+            return dialog
+        else:
+            self.cleanup_progress_text.clear()
 
         # 计算位置 - 相对于主窗口居中
         main_geometry = self.geometry()
@@ -1220,9 +1985,8 @@ class FloatingMonitor(QMainWindow):
         dialog_y = main_geometry.y() + (main_geometry.height() - dialog.height()) // 2
         dialog.move(dialog_x, dialog_y)
 
-        # 显示对话框
+        # 显示对话框（延时启动清理流程时事件循环会先完成绘制，无需 processEvents）
         dialog.show()
-        QApplication.processEvents()
 
         # 启动清理流程
         QTimer.singleShot(100, self._start_cleanup_sequence)
@@ -1231,53 +1995,40 @@ class FloatingMonitor(QMainWindow):
 
     def _add_cleanup_log(self, message: str, level: str = "info"):
         """添加清理日志到对话框"""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")  # 去掉毫秒
-
-        # 根据级别设置颜色
-        color_map = {
-            "info": "#90b0ff",
-            "success": "#50ff80",
-            "warning": "#ffb050",
-            "error": "#ff5050",
-            "debug": "#a0a0d0"
-        }
-        color = color_map.get(level, "#b0b0e0")
-
-        # 添加带颜色的HTML格式文本 - 紧凑格式
-        html = f'<span style="color: {color};">[{timestamp}] {message}</span>'
-        self.cleanup_progress_text.append(html)
-
-        # 滚动到底部
-        cursor = self.cleanup_progress_text.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.cleanup_progress_text.setTextCursor(cursor)
-
-        # 强制刷新UI
-        QApplication.processEvents()
+        # 添加带颜色的HTML格式文本 - 紧凑格式，起始标签按级别预先生成
+        span = _CLEANUP_LOG_SPANS.get(level, _CLEANUP_LOG_DEFAULT_SPAN)
+        html = "%s[%s] %s</span>" % (span, _timestamp(), message)
+        # 不在此处强制 processEvents：各清理步骤之间由 QTimer.singleShot 交还事件循环完成重绘
+        self.cleanup_progress_text.appendHtml(html)
+
+    def _add_cleanup_logs(self, entries: List[Tuple[str, str]]):
+        """批量添加清理日志 [(message, level), ...]：共用同一时间戳，只追加一次文本"""
+        prefix = "[%s] " % _timestamp()
+        self.cleanup_progress_text.appendHtml("<br>".join(
+            "%s%s%s</span>" % (_CLEANUP_LOG_SPANS.get(level, _CLEANUP_LOG_DEFAULT_SPAN), prefix, message)
+            for message, level in entries
+        ))
 
     def _start_cleanup_sequence(self):
         """启动清理序列，逐步执行并显示进度"""
-        from PyQt6.QtCore import QTimer
-
-        self._add_cleanup_log("="*40, "info")  # 减少分隔线长度
-        self._add_cleanup_log("开始清理资源...", "info")
-        self._add_cleanup_log("="*40, "info")
+        self._add_cleanup_logs([
+            (_CLEANUP_SEP, "info"),
+            ("开始清理资源...", "info"),
+            (_CLEANUP_SEP, "info"),
+        ])
 
         # 步骤1: 停止计时器
         QTimer.singleShot(50, self._cleanup_step1_timers)
 
     def _cleanup_step1_timers(self):
         """清理步骤1: 停止计时器"""
-        from PyQt6.QtCore import QTimer
-
         self._add_cleanup_log("► 1/5: 停止计时器", "info")  # 更简洁的步骤标题
         try:
-            if hasattr(self, 'hover_timer') and self.hover_timer:
-                self.hover_timer.stop()
-                self._add_cleanup_log("  ✓ 已停止", "success")
-            else:
-                self._add_cleanup_log("  - 无计时器", "debug")
+            self._cancel_collapse()
+            # 提前通知工作线程停止，使其退出与后续步骤重叠
+            if self.worker is not None and self.worker.isRunning():
+                self.worker.stop()
+            self._add_cleanup_log("  ✓ 已停止", "success")
         except Exception as e:
             self._add_cleanup_log(f"  ✗ 失败: {e}", "error")
 
@@ -1285,120 +2036,108 @@ class FloatingMonitor(QMainWindow):
 
     def _cleanup_step2_worker(self):
         """清理步骤2: 终止工作线程"""
-        from PyQt6.QtCore import QTimer
-
         self._add_cleanup_log("► 2/5: 终止工作线程", "info")
         try:
-            if hasattr(self, 'worker') and self.worker and self.worker.isRunning():
+            if self.worker is not None and self.worker.isRunning():
                 self._add_cleanup_log("  - 发现运行中线程", "debug")
-                self.worker.terminate()
+                # 步骤1已请求停止，优先等待正常退出，超时才强制终止
                 if self.worker.wait(1000):
                     self._add_cleanup_log("  ✓ 已终止", "success")
                 else:
+                    self.worker.terminate()
                     self._add_cleanup_log("  ⚠ 强制结束", "warning")
             else:
                 self._add_cleanup_log("  - 无线程", "debug")
         except Exception as e:
             self._add_cleanup_log(f"  ✗ 失败: {e}", "error")
 
-        QTimer.singleShot(100, self._cleanup_step3_browser_pool)
-
-    def _cleanup_step3_browser_pool(self):
-        """清理步骤3: 清理浏览器池"""
-        from PyQt6.QtCore import QTimer
-
-        self._add_cleanup_log("► 3/5: 清理浏览器池", "info")
+        QTimer.singleShot(100, self._cleanup_start_background_steps)
+
+    def _cleanup_start_background_steps(self):
+        """并行启动清理步骤3、4（后台线程执行，避免 driver.quit/taskkill 阻塞对话框）"""
+        self._cleanup_pending = 2
+        self._cleanup_tasks = [
+            CleanupTask(self._cleanup_step3_browser_pool),
+            CleanupTask(self._cleanup_step4_chrome_processes)
+        ]
+        pool = QThreadPool.globalInstance()
+        for task in self._cleanup_tasks:
+            task.signals.log.connect(self._add_cleanup_log)
+            task.signals.finished.connect(self._on_cleanup_task_finished)
+            pool.start(task)
+
+    def _on_cleanup_task_finished(self):
+        """后台清理步骤完成，全部完成后进入步骤5"""
+        self._cleanup_pending -= 1
+        if self._cleanup_pending == 0:
+            self._cleanup_tasks = []
+            QTimer.singleShot(150, self._cleanup_step5_finalize)
+
+    def _cleanup_step3_browser_pool(self, log):
+        """清理步骤3: 清理浏览器池（后台线程执行，日志经 log 回调投递到UI线程）"""
+        log("► 3/5: 清理浏览器池", "info")
         try:
             from src.browser_pool import _global_pool
             if _global_pool and _global_pool.instances:
-                count = len(_global_pool.instances)
-                self._add_cleanup_log(f"  - 发现 {count} 个实例", "debug")
-
-                for idx, instance in enumerate(_global_pool.instances):
-                    try:
-                        instance.driver.quit()
-                        self._add_cleanup_log(f"  ✓ 实例 {idx+1}/{count}", "success")
-                    except Exception as e:
-                        self._add_cleanup_log(f"  ⚠ 实例 {idx+1} 失败", "warning")
+                instances = list(_global_pool.instances)
+                count = len(instances)
+                log(f"  - 发现 {count} 个实例", "debug")
+
+                executor = ThreadPoolExecutor(max_workers=min(8, count))
+                futures = {
+                    executor.submit(self._shutdown_browser_instance, idx, instance): idx
+                    for idx, instance in enumerate(instances)
+                }
+                done, not_done = wait(futures, timeout=5)
+                # 超时的实例不再等待，交由步骤4的进程清理兜底
+                executor.shutdown(wait=False)
+                for future in done:
+                    log(f"  ✓ 实例 {futures[future]+1}/{count}", "success")
+                for future in not_done:
+                    future.cancel()
+                    log(f"  ⚠ 实例 {futures[future]+1} 超时", "warning")
 
                 _global_pool.instances.clear()
-                self._add_cleanup_log(f"  ✓ 已清空", "success")
+                log(f"  ✓ 已清空", "success")
             else:
-                self._add_cleanup_log("  - 池为空", "debug")
+                log("  - 池为空", "debug")
         except Exception as e:
-            self._add_cleanup_log(f"  ✗ 失败: {e}", "error")
-
-        QTimer.singleShot(150, self._cleanup_step4_chrome_processes)
-
-    def _cleanup_step4_chrome_processes(self):
-        """清理步骤4: 清理Chrome进程"""
-        from PyQt6.QtCore import QTimer
+            log(f"  ✗ 失败: {e}", "error")
 
-        self._add_cleanup_log("► 4/5: 清理Chrome进程", "info")
+    def _cleanup_step4_chrome_processes(self, log):
+        """清理步骤4: 清理Chrome进程（后台线程执行，日志经 log 回调投递到UI线程）"""
+        log("► 4/5: 清理Chrome进程", "info")
         try:
-            import psutil
-            import subprocess
-
-            killed_count = 0
-
-            # Windows使用taskkill
-            if os.name == 'nt':
-                self._add_cleanup_log("  - 运行taskkill...", "debug")
-                try:
-                    result = subprocess.run(
-                        ['taskkill', '/F', '/IM', 'chrome.exe', '/T'],
-                        capture_output=True, timeout=2, text=True
-                    )
-                    if result.returncode == 0:
-                        self._add_cleanup_log("  ✓ chrome.exe", "success")
-
-                    result = subprocess.run(
-                        ['taskkill', '/F', '/IM', 'chromedriver.exe', '/T'],
-                        capture_output=True, timeout=2, text=True
-                    )
-                    if result.returncode == 0:
-                        self._add_cleanup_log("  ✓ chromedriver.exe", "success")
-                except Exception as e:
-                    self._add_cleanup_log(f"  ⚠ taskkill失败", "warning")
-
-            # 使用psutil扫描残留进程
-            self._add_cleanup_log("  - 扫描残留...", "debug")
-            for proc in psutil.process_iter(['name', 'pid']):
-                try:
-                    name = proc.info['name'].lower()
-                    if 'chrome' in name or 'chromedriver' in name:
-                        proc.kill()
-                        killed_count += 1
-                        self._add_cleanup_log(f"  ✓ PID:{proc.info['pid']}", "success")
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-
-            if killed_count > 0:
-                self._add_cleanup_log(f"  ✓ 清理 {killed_count} 个进程", "success")
+            # 按浏览器池记录的PID结束进程树，不再启动 taskkill 子进程，也不按映像名误杀用户的 Chrome
+            from src.browser_pool import kill_browser_processes
+            log("  - 结束浏览器进程树...", "debug")
+            killed_pids = kill_browser_processes(wait_timeout=1)
+
+            # 汇总为一行输出，避免逐个PID写日志
+            if killed_pids:
+                pid_text = ", ".join(str(pid) for pid in killed_pids)
+                log(f"  ✓ 清理 {len(killed_pids)} 个进程 (PID: {pid_text})", "success")
             else:
-                self._add_cleanup_log("  - 无残留", "debug")
+                log("  - 无残留", "debug")
 
         except Exception as e:
-            self._add_cleanup_log(f"  ✗ 失败: {e}", "error")
-
-        QTimer.singleShot(150, self._cleanup_step5_finalize)
+            log(f"  ✗ 失败: {e}", "error")
 
     def _cleanup_step5_finalize(self):
         """清理步骤5: 完成清理"""
-        from PyQt6.QtCore import QTimer
-
-        self._add_cleanup_log("► 5/5: 完成", "info")
-        self._add_cleanup_log("="*40, "info")
-        self._add_cleanup_log("✓ 清理完成", "success")
-        self._add_cleanup_log("正在退出...", "info")
-        self._add_cleanup_log("="*40, "info")
+        self._add_cleanup_logs([
+            ("► 5/5: 完成", "info"),
+            (_CLEANUP_SEP, "info"),
+            ("✓ 清理完成", "success"),
+            ("正在退出...", "info"),
+            (_CLEANUP_SEP, "info"),
+        ])
 
         # 等待800ms让用户看到完成消息
         QTimer.singleShot(800, self._do_final_exit)
 
     def _do_final_exit(self):
         """最终退出"""
-        import os
         self.logger.info("程序退出")
         os._exit(0)
 
@@ -1408,75 +2147,59 @@ class FloatingMonitor(QMainWindow):
 
         try:
             # 1. 停止计时器
-            if hasattr(self, 'hover_timer') and self.hover_timer:
-                self.hover_timer.stop()
-                self.logger.debug("已停止悬停计时器")
+            self._cancel_collapse()
+            self.logger.debug("已取消延迟收缩")
 
             # 2. 强制终止工作线程
-            if hasattr(self, 'worker') and self.worker and self.worker.isRunning():
+            if self.worker is not None and self.worker.isRunning():
                 self.logger.info("正在终止工作线程...")
-                self.worker.terminate()
-                self.worker.wait(500)
+                self.worker.stop()
+                # 协作取消后给进行中的查询留出收尾时间（其 driver 需正常归还），超时才强制终止
+                if not self.worker.wait(2000):
+                    self.worker.terminate()
+                    self.worker.wait(500)
                 self.logger.info("工作线程已终止")
 
-            # 3. 清理浏览器池
+            # 停止定期检查线程（未启动时立即返回）
+            self.service.stop_periodic_check(timeout=1)
+
+            # 3. 清理浏览器池（全部实例确认关闭时，步骤4只需按记录的PID清理）
+            need_sweep = False
             try:
                 from src.browser_pool import _global_pool
                 if _global_pool:
-                    self.logger.info(f"正在清理浏览器池 ({len(_global_pool.instances)} 个实例)...")
-                    futures = []
-                    max_workers = min(8, max(1, len(_global_pool.instances)))
-                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                        for idx, instance in enumerate(_global_pool.instances):
-                            futures.append(executor.submit(self._shutdown_browser_instance, idx, instance))
+                    instances = list(_global_pool.instances)
+                    self.logger.info(f"正在清理浏览器池 ({len(instances)} 个实例)...")
+                    if instances:
+                        executor = ThreadPoolExecutor(max_workers=min(8, len(instances)))
+                        futures = [
+                            executor.submit(self._shutdown_browser_instance, idx, instance)
+                            for idx, instance in enumerate(instances)
+                        ]
                         done, not_done = wait(futures, timeout=5)
+                        # 不用 with 块：其退出时会阻塞等待超时的 quit，总耗时不再受 timeout 约束
+                        executor.shutdown(wait=False)
                         for future in not_done:
                             future.cancel()
                             self.logger.debug("浏览器实例关闭超时，已取消任务")
+                        need_sweep = bool(not_done) or not all(future.result() for future in done)
                     _global_pool.instances.clear()
                     self.logger.info("浏览器池已清理")
             except Exception as e:
+                need_sweep = True
                 self.logger.debug(f"清理浏览器池时出错: {e}")
 
-            # 4. 强制杀死所有Chrome和ChromeDriver进程
+            # 4. 按记录的PID结束本程序启动的Chrome和ChromeDriver进程树
             self.logger.info("正在清理Chrome进程...")
-            import psutil
-            import subprocess
-
             killed_count = 0
-
-            # Windows使用taskkill命令
-            if os.name == 'nt':
-                try:
-                    result = subprocess.run(
-                        ['taskkill', '/F', '/IM', 'chrome.exe', '/T'],
-                        capture_output=True, timeout=2, text=True
-                    )
-                    if result.returncode == 0:
-                        self.logger.debug("taskkill已终止chrome.exe")
-
-                    result = subprocess.run(
-                        ['taskkill', '/F', '/IM', 'chromedriver.exe', '/T'],
-                        capture_output=True, timeout=2, text=True
-                    )
-                    if result.returncode == 0:
-                        self.logger.debug("taskkill已终止chromedriver.exe")
-                except Exception as e:
-                    self.logger.debug(f"taskkill命令失败: {e}")
-
-            # 使用psutil杀死残留进程
             try:
-                for proc in psutil.process_iter(['name', 'pid']):
-                    try:
-                        name = proc.info['name'].lower()
-                        if 'chrome' in name or 'chromedriver' in name:
-                            proc.kill()
-                            killed_count += 1
-                            self.logger.debug(f"已终止进程: {proc.info['name']} (PID: {proc.info['pid']})")
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
+                from src.browser_pool import kill_browser_processes
+                killed_pids = kill_browser_processes(wait_timeout=1, sweep=need_sweep)
+                killed_count = len(killed_pids)
+                if killed_pids:
+                    self.logger.debug(f"已终止进程 PID: {killed_pids}")
             except Exception as e:
-                self.logger.debug(f"使用psutil清理进程失败: {e}")
+                self.logger.debug(f"清理浏览器进程失败: {e}")
 
             if killed_count > 0:
                 self.logger.info(f"已清理 {killed_count} 个Chrome相关进程")
@@ -1485,8 +2208,6 @@ class FloatingMonitor(QMainWindow):
 
             # 5. 清理临时目录（如果有）
             try:
-                import tempfile
-                import shutil
                 temp_base = tempfile.gettempdir()
                 self.logger.debug(f"检查临时目录: {temp_base}")
                 # 这里可以添加清理特定临时文件的逻辑
@@ -1498,8 +2219,9 @@ class FloatingMonitor(QMainWindow):
         except Exception as e:
             self.logger.error(f"清理资源时发生错误: {e}")
 
-    def _shutdown_browser_instance(self, idx: int, instance: Any):
-        """并行关闭浏览器实例"""
+    def _shutdown_browser_instance(self, idx: int, instance: Any) -> bool:
+        """并行关闭浏览器实例，返回 Chromedriver 是否已确认结束"""
+        stopped = False
         try:
             self.logger.debug(f"正在关闭浏览器实例 {idx+1}...")
 
@@ -1513,6 +2235,7 @@ class FloatingMonitor(QMainWindow):
                     try:
                         proc.kill()
                         proc.wait(timeout=2)
+                        stopped = True
                         self.logger.debug(f"已终止 Chromedriver 进程 (实例 {idx+1})")
                     except Exception as kill_err:
                         self.logger.debug(f"终止 Chromedriver 进程失败 (实例 {idx+1}): {kill_err}")
@@ -1520,10 +2243,12 @@ class FloatingMonitor(QMainWindow):
             if driver is not None:
                 try:
                     driver.quit()
+                    stopped = True
                 except Exception as quit_err:
                     self.logger.debug(f"调用 driver.quit() 失败 (实例 {idx+1}): {quit_err}")
         except Exception as e:
             self.logger.debug(f"关闭浏览器实例 {idx+1} 失败: {e}")
+        return stopped
 
     def _do_force_quit(self):
         """执行强制退出"""
@@ -1533,7 +2258,6 @@ class FloatingMonitor(QMainWindow):
         self._cleanup_all_resources()
 
         # 强制退出
-        import os
         self.logger.info("程序即将退出")
         os._exit(0)
 
@@ -1558,7 +2282,7 @@ class FloatingMonitor(QMainWindow):
     def query(self):
         """开始查询"""
         try:
-            if self.worker and self.worker.isRunning():
+            if self.worker is not None and self.worker.isRunning():
                 self.add_progress("查询正在进行中，请稍候...")
                 return
 
@@ -1576,29 +2300,43 @@ class FloatingMonitor(QMainWindow):
             self.btn.setEnabled(False)
 
             # 查询时保持展开状态
-            self.hover_timer.stop()
+            self._cancel_collapse()
 
             # 清空并初始化进度显示
+            self._pending_progress.clear()
             self.progress_text.clear()
-            self.add_progress("="*50)
-            self.add_progress("开始查询所有账号...")
-            self.add_progress(f"共 {self.table.rowCount()} 个账号待查询")
-            self.add_progress("="*50)
+            self.add_progress_lines([
+                _PROGRESS_SEP,
+                "开始查询所有账号...",
+                f"共 {self.table.rowCount()} 个账号待查询",
+                _PROGRESS_SEP,
+            ])
 
             # 自动切换到进度视图
             if not self.progress_text.isVisible():
                 self.toggle_progress()
 
-            for i in range(self.table.rowCount()):
-                self.table.item(i, 1).setText("查询中...")
-                self.table.item(i, 2).setText("...")
+            # 逐行置为查询中，期间暂停表格重绘与 itemChanged 信号
+            self.table.setUpdatesEnabled(False)
+            self.table.blockSignals(True)
+            try:
+                for i, (balance_item, status_item) in enumerate(zip(self._balance_items, self._status_items)):
+                    balance_item.setText("查询中...")
+                    status_item.setText("...")
+                    self._set_row_value(i, None)
+                    self._row_statuses[i] = "..."
+            finally:
+                self.table.blockSignals(False)
+                self.table.setUpdatesEnabled(True)
 
             # 创建并启动工作线程
-            self.worker = MonitorWorker(self.service)
-            self.worker.result.connect(self.update_result)
-            self.worker.progress.connect(self.update_progress)
-            self.worker.finished.connect(self.query_done)
-            self.worker.start()
+            # 首次查询时创建工作线程并连接信号，之后每次查询复用
+            if self.worker is None:
+                self.worker = MonitorWorker(self.service)
+                self.worker.results_batch.connect(self.update_results_batch)
+                self.worker.finished.connect(self.query_done)
+            self.worker.restart()
+            self._query_run_id = self.worker.run_id
 
             self.logger.info(f"开始查询 {self.table.rowCount()} 个账号")
 
@@ -1613,108 +2351,142 @@ class FloatingMonitor(QMainWindow):
                 f"启动查询时发生错误:\n\n{str(e)}"
             )
 
-    def update_result(self, user, balance, success):
-        """更新查询结果"""
-        for i in range(self.table.rowCount()):
-            # 检查用户名（可能带有●标记）
-            current_display = self.table.item(i, 0).text()
-            actual_username = current_display
-            for marker in ("●", "◎"):
-                actual_username = actual_username.replace(marker, "")
-            actual_username = actual_username.strip()
-
-            if actual_username == user:
-                self.table.item(i, 1).setText(balance)
-                self.table.item(i, 2).setText("OK" if success else "ERR")
-
-                # 设置状态颜色
-                status_item = self.table.item(i, 2)
-                if success:
-                    status_item.setForeground(QColor("#4caf50"))  # 绿色
-                    # 添加成功日志
-                    self.add_progress(f"✓ {user}: {balance} - 查询成功")
-                else:
-                    status_item.setForeground(QColor("#f44336"))  # 红色
-                    # 添加失败日志
-                    self.add_progress(f"✗ {user}: {balance} - 查询失败")
-                break
+    def update_results_batch(self, run_id: int, items: List[Tuple[str, str, bool]]):
+        """批量更新查询结果（工作线程已攒批，整批写入期间暂停表格重绘与信号）"""
+        # 已取消的上一轮查询迟到的批次不再写入表格
+        if run_id != self._query_run_id:
+            return
+
+        lines: List[str] = []
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            for user, balance, success in items:
+                line = self._apply_result(user, balance, success)
+                if line:
+                    lines.append(line)
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+
+        # 整批结果日志共用一个时间戳一次追加
+        self.add_progress_lines(lines)
+
+        # 查询过程中实时刷新总余额，多个批次合并为一次
+        self._total_update_timer.start()
+
+    def _apply_result(self, user, balance, success) -> Optional[str]:
+        """将单个查询结果写入表格，返回对应的进度日志行（账号不在表格中时返回 None）"""
+        # 按用户名索引定位行，无需逐行解析带标记的显示名称
+        i = self._username_to_row.get(user)
+        if i is None or i >= len(self._status_items):
+            return None
+
+        status_text = "OK" if success else "ERR"
+        status_item = self._status_items[i]
+        self._balance_items[i].setText(balance)
+        status_item.setText(status_text)
+        self._set_row_value(i, _parse_balance(balance) if success else None)
+        self._row_statuses[i] = status_text
+
+        # 设置状态颜色，并返回成功/失败日志
+        if success:
+            status_item.setForeground(_STATUS_OK_BRUSH)  # 绿色
+            return f"✓ {user}: {balance} - 查询成功"
+        status_item.setForeground(_STATUS_ERR_BRUSH)  # 红色
+        return f"✗ {user}: {balance} - 查询失败"
 
     def query_done(self):
         """查询完成"""
         self.btn.setText("查 询")
         self.btn.setEnabled(True)
 
-        # 计算并显示总余额
+        # 计算并显示总余额（汇总日志需要最新合计，立即执行并取消挂起的防抖刷新）
+        self._total_update_timer.stop()
         self.update_total_balance()
 
         # 统计查询结果
-        total_count = self.table.rowCount()
-        success_count = 0
-        fail_count = 0
-
-        for i in range(total_count):
-            status = self.table.item(i, 2).text()
-            if status == "OK":
-                success_count += 1
-            elif status == "ERR":
-                fail_count += 1
+        # 状态列文本已缓存在 _row_statuses，C 层计数一次完成
+        counts = Counter(self._row_statuses)
+        total_count = len(self._row_statuses)
+        success_count = counts["OK"]
+        fail_count = counts["ERR"]
 
         # 添加汇总日志
-        self.add_progress("="*50)
-        self.add_progress(f"查询完成！成功: {success_count}/{total_count}, 失败: {fail_count}")
+        summary = [_PROGRESS_SEP, f"查询完成！成功: {success_count}/{total_count}, 失败: {fail_count}"]
         if success_count > 0:
-            self.add_progress(f"总余额: ${self.current_total_balance:.2f}")
-        self.add_progress("="*50)
+            summary.append(f"总余额: ${self.current_total_balance:.2f}")
+        summary.append(_PROGRESS_SEP)
+        self.add_progress_lines(summary)
 
         # 查询完成后启动自动收缩计时器
         if not self.underMouse():
-            self.hover_timer.start(2000)  # 2秒后自动收缩
+            self._schedule_collapse(2000)  # 2秒后自动收缩
+
+    def _set_row_value(self, row: int, value: Optional[float]):
+        """更新某行计入总余额的数值，增量维护合计"""
+        old = self._row_values[row]
+        if old is not None:
+            self._values_total -= old
+            self._values_count -= 1
+        if value is not None:
+            self._values_total += value
+            self._values_count += 1
+        if self._values_count == 0:
+            self._values_total = 0.0  # 避免浮点累计误差残留
+        self._row_values[row] = value
+        self._total_dirty = True
 
     def update_total_balance(self):
-        """计算并更新总余额显示"""
-        total = 0.0
-        success_count = 0
-
-        for i in range(self.table.rowCount()):
-            balance_text = self.table.item(i, 1).text()
-            status_text = self.table.item(i, 2).text()
+        """更新总余额显示（合计已增量维护，无变化时跳过）"""
+        if not self._total_dirty:
+            return
+        self._total_dirty = False
 
-            # 统计成功查询与缓存余额
-            if status_text in ("OK", "缓存"):
-                try:
-                    # 尝试解析余额（移除可能的货币符号和格式）
-                    balance_str = balance_text.replace('$', '').replace('¥', '').replace(',', '').strip()
-                    balance = float(balance_str)
-                    total += balance
-                    success_count += 1
-                except (ValueError, AttributeError):
-                    # 无法解析的余额跳过
-                    pass
+        total = self._values_total
+        success_count = self._values_count
 
         # 保存总余额用于收缩状态显示
         self.current_total_balance = total
 
         # 更新展开状态的显示
         if success_count > 0:
-            self.total_label.setText(f"总余额: ${total:.2f} ({success_count}个账号)")
-            self.total_label.setStyleSheet("""
-                font-size: 12px;
-                color: #90ff90;
-                padding: 4px;
-                font-weight: bold;
-            """)
+            total_text = "总余额: $%.2f (%d个账号)" % (total, success_count)
+            state = "active"
             # 更新收缩状态的显示
-            self.collapsed_label.setText(f"${total:.0f}")
+            collapsed_text = "$%.0f" % total
         else:
-            self.total_label.setText("总余额: --")
-            self.total_label.setStyleSheet("""
-                font-size: 12px;
-                color: #a0a0c0;
-                padding: 4px;
-                font-weight: bold;
-            """)
+            total_text = "总余额: --"
+            state = "empty"
             # 无数据时显示$0
-            self.collapsed_label.setText("$0")
+            collapsed_text = "$0"
+
+        # 文本未变时不 setText，避免标签重新计算尺寸与重绘
+        if total_text != self.total_label.text():
+            self.total_label.setText(total_text)
+        if collapsed_text != self.collapsed_label.text():
+            self.collapsed_label.setText(collapsed_text)
+
+        # 只在有无数据切换时更新 state 属性并重新套用样式
+        if self._total_label_state != state:
+            self._total_label_state = state
+            self.total_label.setProperty("state", state)
+            _repolish(self.total_label)
+
+    def _set_cursor(self, shape: Qt.CursorShape):
+        """设置窗口光标，与当前光标相同时跳过"""
+        if shape == self._current_cursor:
+            return
+        self._current_cursor = shape
+        self.setCursor(shape)
+
+    def _set_content_state(self, state: str):
+        """切换内容区 state 属性并重新套用样式，与当前状态相同时跳过"""
+        if self._content_state == state:
+            return
+        self._content_state = state
+        self.content_widget.setProperty("state", state)
+        _repolish(self.content_widget)
 
     def set_collapsed_state(self):
         """设置为收缩状态"""
@@ -1725,96 +2497,113 @@ class FloatingMonitor(QMainWindow):
             current_rect = self.geometry()
             self.collapsed_center = current_rect.center()
 
-        # 隐藏所有控件除了收缩图标
-        self.btn.hide()
-        self.env_label.hide()
-        self.table.hide()
-        self.progress_text.hide()
-        self.toggle_btn.hide()
-        self.total_label.hide()
-        self.quit_btn.hide()
-        self.collapsed_label.show()
-
-        # 调整窗口大小
-        self.setFixedSize(*self.collapsed_size)
-
-        # 更新样式为圆形
-        self.content_widget.setStyleSheet("""
-            #content {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(50, 50, 80, 200),
-                    stop:1 rgba(80, 60, 100, 200));
-                border-radius: 25px;
-                border: 2px solid rgba(130, 130, 255, 0.5);
-            }
-            #content:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(60, 60, 90, 220),
-                    stop:1 rgba(90, 70, 110, 220));
-                border: 2px solid rgba(150, 150, 255, 0.7);
-            }
-        """)
+        # 批量切换控件可见性与样式，期间暂停重绘，结束后统一刷新一次
+        self.content_widget.setUpdatesEnabled(False)
+        try:
+            # 隐藏所有控件除了收缩图标
+            for widget in self._expand_visible_children:
+                widget.setVisible(False)
+            self.progress_text.setVisible(False)
+            self.collapsed_label.setVisible(True)
+
+            # 调整窗口大小（direct_collapse 已调整过则跳过），圆外区域由透明背景处理
+            if self.size() != self._collapsed_qsize:
+                self.setFixedSize(self._collapsed_qsize)
+
+            # 切换尺寸后即预渲染光晕图，首帧绘制只需贴图
+            self._get_glow_pixmap()
+
+            # 更新样式为圆形
+            self._set_content_state("collapsed")
+        finally:
+            self.content_widget.setUpdatesEnabled(True)
 
         # 设置鼠标样式为可移动
-        self.setCursor(Qt.CursorShape.SizeAllCursor)
+        self._set_cursor(Qt.CursorShape.SizeAllCursor)
 
     def set_expanded_state(self):
         """设置为展开状态"""
         self.is_expanded = True
 
-        # 显示所有控件
-        self.collapsed_label.hide()
-        self.btn.show()
-        self.env_label.show()
-        self.table.show()
-        self.toggle_btn.show()
-        self.total_label.show()
-        self.quit_btn.show()
-
-        # 恢复样式
-        self.content_widget.setStyleSheet("""
-            #content {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(20, 20, 30, 230),
-                    stop:1 rgba(30, 30, 45, 230));
-                border-radius: 25px;
-                border: 1px solid rgba(100, 100, 255, 0.2);
-            }
-        """)
+        # 批量切换控件可见性与样式，期间暂停重绘，结束后统一刷新一次
+        self.content_widget.setUpdatesEnabled(False)
+        try:
+            # 显示所有控件
+            self.collapsed_label.setVisible(False)
+            for widget in self._expand_visible_children:
+                widget.setVisible(True)
+
+            # 恢复样式
+            self._set_content_state("expanded")
+        finally:
+            self.content_widget.setUpdatesEnabled(True)
 
         # 设置展开状态的鼠标样式
-        self.setCursor(Qt.CursorShape.ArrowCursor)
+        self._set_cursor(Qt.CursorShape.ArrowCursor)
 
     def direct_expand(self):
         """直接展开 - 无动画"""
         if self.is_expanded:
             return
 
+        # 窗口已是展开尺寸（仅状态标记不一致），只需切换控件状态
+        if self.size() == self._expanded_qsize:
+            self.set_expanded_state()
+            return
+
         # 保存当前小圆圈的中心点
         current_rect = self.geometry()
         self.collapsed_center = current_rect.center()
-        center_x = self.collapsed_center.x()
-        center_y = self.collapsed_center.y()
+        center = (self.collapsed_center.x(), self.collapsed_center.y())
 
-        # 计算展开后的位置（以小圆圈为中心）
-        target_x = center_x - self.expanded_size[0] // 2
-        target_y = center_y - self.expanded_size[1] // 2
+        cache = self._expand_cache
+        if cache is not None and cache[0] == center:
+            target_x, target_y = cache[1]
+        else:
+            # 计算展开后的位置（以小圆圈为中心）
+            target_x = center[0] - self.expanded_size[0] // 2
+            target_y = center[1] - self.expanded_size[1] // 2
 
-        # 边界检测和调整
-        screen = QApplication.primaryScreen().availableGeometry()
-        target_x = max(10, min(target_x, screen.width() - self.expanded_size[0] - 10))
-        target_y = max(10, min(target_y, screen.height() - self.expanded_size[1] - 10))
+            # 边界检测和调整
+            screen = self._avail_geom
+            target_x = max(10, min(target_x, screen.width() - self.expanded_size[0] - 10))
+            target_y = max(10, min(target_y, screen.height() - self.expanded_size[1] - 10))
+            self._expand_cache = (center, (target_x, target_y))
 
         # 直接设置为展开状态
-        self.setFixedSize(*self.expanded_size)
+        self.setFixedSize(self._expanded_qsize)
         self.move(target_x, target_y)
         self.set_expanded_state()
 
+    def _watch_primary_screen(self, screen):
+        """监听主屏可用区域变化（主屏切换时改为监听新主屏）"""
+        if screen is None or screen is self._primary_screen:
+            return
+        previous = self._primary_screen
+        if previous is not None:
+            try:
+                previous.availableGeometryChanged.disconnect(self._on_screen_geometry_changed)
+            except TypeError:
+                pass
+        self._primary_screen = screen
+        screen.availableGeometryChanged.connect(self._on_screen_geometry_changed)
+        self._on_screen_geometry_changed(screen.availableGeometry())
+
+    def _on_screen_geometry_changed(self, geometry: QRect):
+        """屏幕可用区域变化，刷新缓存并清除展开位置缓存"""
+        self._avail_geom = geometry
+        self._expand_cache = None
+
     def direct_collapse(self):
         """直接收缩 - 无动画"""
         if not self.is_expanded:
             return
 
+        # 窗口已是收缩尺寸（仅状态标记不一致），只需切换控件状态
+        if self.size() == self._collapsed_qsize:
+            self.set_collapsed_state()
+            return
+
         # 获取当前窗口的中心
         current_rect = self.geometry()
         center_x = current_rect.center().x()
@@ -1826,83 +2615,174 @@ class FloatingMonitor(QMainWindow):
         target_y = center_y - self.collapsed_size[1] // 2
 
         # 直接设置为收缩状态
-        self.setFixedSize(*self.collapsed_size)
+        self.setFixedSize(self._collapsed_qsize)
         self.move(target_x, target_y)
         self.set_collapsed_state()
 
+    def _schedule_collapse(self, delay_ms: int):
+        """延迟收缩，重复调度时仅最后一次生效"""
+        self._collapse_due = time.monotonic() + delay_ms / 1000.0
+        if not self._collapse_timer_armed:
+            self._collapse_timer_armed = True
+            QTimer.singleShot(delay_ms, self._on_collapse_timeout)
+
+    def _cancel_collapse(self):
+        """取消尚未触发的延迟收缩（已挂起的计时器到期后空转）"""
+        self._collapse_due = None
+
+    def _on_collapse_timeout(self):
+        """延迟收缩计时到期：到期时间被推迟则按剩余时间重新挂起"""
+        self._collapse_timer_armed = False
+        due = self._collapse_due
+        if due is None:
+            return
+
+        remaining_ms = int((due - time.monotonic()) * 1000)
+        if remaining_ms > 0:
+            self._collapse_timer_armed = True
+            QTimer.singleShot(remaining_ms, self._on_collapse_timeout)
+            return
+
+        self.start_collapse()
+
     def start_collapse(self):
         """开始收缩（延迟后）"""
+        self._cancel_collapse()
         self.direct_collapse()
-        self.hover_timer.stop()
 
     def enterEvent(self, event):
         """鼠标进入事件"""
-        self.hover_timer.stop()
-        self.direct_expand()
+        self._cancel_collapse()
+        if not self.is_expanded:
+            self.direct_expand()
         super().enterEvent(event)
 
     def leaveEvent(self, event):
         """鼠标离开事件"""
-        # 延迟收缩，避免误触
-        if not self.worker or not self.worker.isRunning():
-            self.hover_timer.stop()
-            self.hover_timer.start(600)  # 600ms后收缩
+        # 延迟收缩，避免误触（已是收缩状态时无需挂起计时）
+        if self.is_expanded and (self.worker is None or not self.worker.isRunning()):
+            self._schedule_collapse(600)  # 600ms后收缩
         super().leaveEvent(event)
 
     def mousePressEvent(self, event):
         """鼠标按下事件（用于拖动）"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.drag_pos = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
+        button = event.button()
+        if button != Qt.MouseButton.LeftButton and button != Qt.MouseButton.RightButton:
+            return
+
+        global_pos = event.globalPosition().toPoint()
+        if button == Qt.MouseButton.LeftButton:
+            self.drag_pos = global_pos - self.frameGeometry().topLeft()
+            self._last_move_pos = self.pos()
             # 按下时改变光标
             if not self.is_expanded:
-                self.setCursor(Qt.CursorShape.ClosedHandCursor)
+                self._set_cursor(Qt.CursorShape.ClosedHandCursor)
             # 拖动时禁用悬停效果，避免干扰
-            self.hover_timer.stop()
-        elif event.button() == Qt.MouseButton.RightButton:
+            self._cancel_collapse()
+        else:
             # 右键菜单
-            self.show_main_context_menu(event.globalPosition().toPoint())
+            self.show_main_context_menu(global_pos)
 
     def mouseMoveEvent(self, event):
         """鼠标移动事件（用于拖动）"""
-        if event.buttons() == Qt.MouseButton.LeftButton and hasattr(self, 'drag_pos'):
+        if self.drag_pos is not None and event.buttons() == Qt.MouseButton.LeftButton:
             new_pos = event.globalPosition().toPoint() - self.drag_pos
-            self.move(new_pos)
-            # 拖动后更新中心点位置
-            self.collapsed_center = self.geometry().center()
+            # 与已记录的待移动位置相同（高回报率鼠标的抖动事件），计时器已在运行，直接返回
+            if new_pos == self._pending_move_pos:
+                return
+            # 亚像素移动取整后位置不变，无需移动
+            if new_pos == self._last_move_pos:
+                self._pending_move_pos = None
+                return
+            self._pending_move_pos = new_pos
+            # 拖动期间窗口内容不变，暂停重绘，释放时统一刷新一次
+            if self.updatesEnabled():
+                self.setUpdatesEnabled(False)
+            if not self._move_throttle.isActive():
+                self._move_throttle.start()
+
+    def _flush_move(self):
+        """执行最近一次记录的拖动目标位置"""
+        self._move_throttle.stop()
+        if self._pending_move_pos is None:
+            return
+        self.move(self._pending_move_pos)
+        self._last_move_pos = self._pending_move_pos
+        self._pending_move_pos = None
 
     def mouseReleaseEvent(self, event):
         """鼠标释放事件"""
         if event.button() == Qt.MouseButton.LeftButton:
+            # 立即应用尚未执行的拖动位置
+            self._flush_move()
+            self.drag_pos = None
+            if not self.updatesEnabled():
+                self.setUpdatesEnabled(True)
+                self.update()
+                # 拖动结束后更新中心点位置（拖动过程中不逐次计算）
+                self.collapsed_center = self.geometry().center()
+
             # 释放时恢复光标
             if not self.is_expanded:
-                self.setCursor(Qt.CursorShape.SizeAllCursor)
+                self._set_cursor(Qt.CursorShape.SizeAllCursor)
             else:
-                self.setCursor(Qt.CursorShape.ArrowCursor)
+                self._set_cursor(Qt.CursorShape.ArrowCursor)
 
             # 如果鼠标不在窗口上，启动收缩计时器
             if not self.underMouse() and self.is_expanded:
-                self.hover_timer.start(600)
+                self._schedule_collapse(600)
         super().mouseReleaseEvent(event)
 
     def paintEvent(self, event):
         """绘制事件 - 为小圆圈状态添加发光效果"""
         if not self.is_expanded:
+            pixmap = self._get_glow_pixmap()
             painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.drawPixmap(self._glow_bounds.topLeft(), pixmap)
+            painter.end()
+            # 收缩状态没有工具栏/停靠区等需要基类绘制的内容
+            return
 
-            # 绘制发光效果
-            center = QPoint(self.width() // 2, self.height() // 2)
-            glow_color = QColor(128, 128, 255, 30)
+        super().paintEvent(event)
 
-            # 绘制多层光晕
-            for i in range(3):
-                painter.setBrush(QBrush(glow_color))
-                painter.setPen(Qt.PenStyle.NoPen)
-                radius = self.collapsed_size[0] // 2 - 2 + (i * 3)
-                painter.drawEllipse(center, radius, radius)
-                glow_color.setAlpha(glow_color.alpha() - 10)
+    def _get_glow_pixmap(self) -> QPixmap:
+        """获取小圆圈光晕图（预渲染缓存，窗口尺寸或缩放比例变化时重建）
+
+        缓存图只覆盖光晕外接正方形与窗口的交集（窗口外的部分不可见，无需渲染），
+        绘制时贴到 _glow_bounds 左上角。
+        """
+        width, height = self.width(), self.height()
+        ratio = self.devicePixelRatioF()
+        key = (width, height, ratio)
+        if self._glow_pixmap is not None and self._glow_key == key:
+            return self._glow_pixmap
+
+        half_side = self._glow_half_side
+        side = half_side * 2
+        self._glow_bounds = QRect(
+            width // 2 - half_side, height // 2 - half_side, side, side
+        ).intersected(self.rect())
+
+        pixmap = QPixmap(
+            round(self._glow_bounds.width() * ratio), round(self._glow_bounds.height() * ratio)
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
 
-        super().paintEvent(event)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        # 绘制多层光晕（半径与画刷均已预先算好，坐标相对缓存图左上角）
+        center = QPoint(width // 2 - self._glow_bounds.x(), height // 2 - self._glow_bounds.y())
+        for radius, brush in self._glow_layers:
+            painter.setBrush(brush)
+            painter.drawEllipse(center, radius, radius)
+        painter.end()
+
+        self._glow_pixmap = pixmap
+        self._glow_key = key
+        return pixmap
 
     def closeEvent(self, event):
         """窗口关闭事件"""
@@ -1917,9 +2797,12 @@ class FloatingMonitor(QMainWindow):
         # 接受关闭事件
         event.accept()
 
-        # 强制退出
-        import os
-        os._exit(0)
+        # 正常退出事件循环，让日志等缓冲完成收尾；若有残留非守护线程阻塞解释器退出，
+        # 由守护计时线程兜底强制退出（事件循环结束后 QTimer 不再触发，故不用 QTimer）
+        watchdog = threading.Timer(self.EXIT_WATCHDOG_SECONDS, os._exit, args=(0,))
+        watchdog.daemon = True
+        watchdog.start()
+        QApplication.quit()
 
 
 def main():
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""browser_pool 测试（用假 driver 替换 Chrome 创建，不启动浏览器）"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("psutil")
+
+from src import browser_pool  # noqa: E402
+from src.browser_pool import BrowserInstance, BrowserPool  # noqa: E402
+
+
+class FakeDriver:
+    """假 WebDriver，记录是否已 quit；服务进程PID取当前进程以便记录PID"""
+
+    def __init__(self):
+        self.quit_called = False
+        self.alive = True
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=os.getpid()))
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def fake_create(monkeypatch):
+    """替换 _create_browser_instance：与真实实现一样在创建后调用 _track_driver_pids"""
+    created = []
+
+    def create(pool, browser_id):
+        driver = FakeDriver()
+        pool._track_driver_pids(driver)
+        now = datetime.now()
+        instance = BrowserInstance(driver=driver, browser_id=browser_id, created_at=now, last_used=now)
+        created.append(instance)
+        return instance
+
+    monkeypatch.setattr(BrowserPool, "_create_browser_instance", create)
+    monkeypatch.setattr(BrowserPool, "_reset_browser_state", lambda pool, driver: None)
+    return created
+
+
+def test_get_browser_reuses_pooled_instance(fake_create):
+    pool = BrowserPool(pool_size=1, max_pool_size=2)
+
+    with pool.get_browser() as first:
+        pass
+    with pool.get_browser() as second:
+        pass
+
+    assert first is second
+    assert len(fake_create) == 1
+    assert pool.stats['total_reused'] == 2
+
+
+def test_expired_instance_is_recreated(fake_create):
+    """超过 browser_ttl 的实例在取用时重建，实例列表同步替换"""
+    pool = BrowserPool(pool_size=1, max_pool_size=2, config={"browser_ttl": 60})
+    old = pool.instances[0]
+    old.created_at = datetime.now() - timedelta(seconds=120)
+
+    with pool.get_browser() as driver:
+        assert driver is not old.driver
+
+    assert old.driver.quit_called
+    assert pool.instances == [fake_create[-1]]
+    assert pool.instances[0].browser_id == old.browser_id
+
+
+def test_invalidated_instance_is_recreated_on_next_get(fake_create):
+    pool = BrowserPool(pool_size=1, max_pool_size=2)
+
+    with pool.get_browser() as driver:
+        pool.invalidate(driver)
+        stale = driver
+
+    with pool.get_browser() as driver:
+        assert driver is not stale
+
+    assert stale.quit_called
+    assert len(pool.instances) == 1
+
+
+def test_pool_grows_without_deadlock_and_respects_max_size(fake_create):
+    """池空时扩容（创建过程会再次取锁记录PID）不死锁，且不超过最大实例数"""
+    pool = BrowserPool(pool_size=1, max_pool_size=2)
+    outcome = {}
+
+    def borrow_three():
+        with pool.get_browser(timeout=0.01) as a, \
+                pool.get_browser(timeout=0.01) as b, \
+                pool.get_browser(timeout=0.01) as c:
+            outcome["drivers"] = (a, b, c)
+            # 持有借出的实例期间池锁必须可用，其他借用方才不会被阻塞
+            outcome["lock_free"] = pool.lock.acquire(timeout=1)
+            if outcome["lock_free"]:
+                pool.lock.release()
+
+    thread = threading.Thread(target=borrow_three, daemon=True)
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive(), "get_browser 扩容时死锁"
+    a, b, c = outcome["drivers"]
+    assert a is not None and b is not None and c is None
+    assert outcome["lock_free"]
+    assert len(pool.instances) == 2
+    assert pool._pending_creates == 0
+    assert os.getpid() in pool.spawned_pids
+
+
+class _FakeProcess:
+    """记录 children 调用的假 psutil.Process"""
+
+    children_calls = 0
+
+    def __init__(self, pid=None):
+        self.pid = pid
+
+    def children(self, recursive=False):
+        type(self).children_calls += 1
+        return []
+
+
+@pytest.mark.parametrize("sweep, expected_calls", [(False, 0), (True, 1)])
+def test_kill_browser_processes_sweep_flag(monkeypatch, sweep, expected_calls):
+    """sweep=False 时只处理浏览器池记录的进程，不遍历本进程的子进程"""
+    import psutil
+
+    fake_pool = SimpleNamespace(kill_spawned_processes=lambda: [])
+    monkeypatch.setattr(browser_pool, "_global_pool", fake_pool)
+    monkeypatch.setattr(psutil, "Process", _FakeProcess)
+    monkeypatch.setattr(_FakeProcess, "children_calls", 0)
+
+    assert browser_pool.kill_browser_processes(sweep=sweep) == []
+    assert _FakeProcess.children_calls == expected_calls
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""config_manager 测试"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.config_manager import ConfigManager
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    (tmp_path / "credentials.txt").write_text(
+        "# 注释\nalice,pw1,sk-a\nbob,pw2\n\nbroken-line\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def test_load_accounts_parses_credentials(config_dir):
+    config = ConfigManager(str(config_dir))
+
+    assert [(a.username, a.password, a.api_key) for a in config.accounts] == [
+        ("alice", "pw1", "sk-a"),
+        ("bob", "pw2", ""),
+    ]
+
+
+def test_missing_config_creates_default_file(config_dir):
+    config = ConfigManager(str(config_dir))
+
+    saved = json.loads((config_dir / "config.json").read_text(encoding="utf-8"))
+    assert saved["performance"]["query_interval"] == config.get_performance_config()["query_interval"]
+
+
+def test_user_config_is_merged_with_defaults(config_dir):
+    (config_dir / "config.json").write_text(
+        json.dumps({"browser": {"browser_ttl": 60}}), encoding="utf-8"
+    )
+
+    config = ConfigManager(str(config_dir))
+
+    assert config.get_browser_config()["browser_ttl"] == 60
+    assert config.get_browser_config()["page_load_timeout"] == 20
+
+
+def test_save_accounts_round_trip_leaves_no_temp_file(config_dir):
+    config = ConfigManager(str(config_dir))
+    assert config.add_account("carol", "pw3", "sk-c")
+    assert config.update_account("bob", api_key="sk-b")
+    assert config.remove_account("alice")
+
+    reloaded = ConfigManager(str(config_dir))
+
+    assert [(a.username, a.api_key) for a in reloaded.accounts] == [("bob", "sk-b"), ("carol", "sk-c")]
+    assert not list(config_dir.glob("*.tmp"))
+
+
+def test_failed_save_keeps_previous_file(config_dir, monkeypatch):
+    """写临时文件失败时原账号文件保持不变（先写临时文件再替换）"""
+    config = ConfigManager(str(config_dir))
+    original = (config_dir / "credentials.txt").read_text(encoding="utf-8")
+
+    def fail_replace(self, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Path, "replace", fail_replace)
+    config.add_account("carol", "pw3")
+
+    assert (config_dir / "credentials.txt").read_text(encoding="utf-8") == original
+
+
+def test_update_config_value_persists(config_dir):
+    # 提供用户配置，使 performance 段为合并出的新字典，修改时不影响 DEFAULT_CONFIG
+    (config_dir / "config.json").write_text(json.dumps({"performance": {}}), encoding="utf-8")
+    config = ConfigManager(str(config_dir))
+    assert config.update_config_value("performance", "query_interval", 120)
+    assert not config.update_config_value("missing", "key", 1)
+
+    reloaded = ConfigManager(str(config_dir))
+
+    assert reloaded.get_performance_config()["query_interval"] == 120
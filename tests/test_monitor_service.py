@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""monitor_service 测试（使用假浏览器池，不启动Chrome）"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from src import monitor_service  # noqa: E402
+from src.config_manager import Account  # noqa: E402
+from src.monitor_service import BalanceMonitorService  # noqa: E402
+
+
+class FakeDriver:
+    """假 WebDriver：alive=False 时读取 current_url 抛异常，模拟会话失效"""
+
+    def __init__(self, name: str, alive: bool = True):
+        self.name = name
+        self.alive = alive
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return "about:blank"
+
+
+class FakePool:
+    """按顺序借出预置 driver 的假浏览器池"""
+
+    max_pool_size = 9
+
+    def __init__(self, drivers):
+        self.drivers = list(drivers)
+        self.borrowed = []
+        self.invalidated = []
+
+    @contextmanager
+    def get_browser(self, timeout: int = 30):
+        driver = self.drivers.pop(0)
+        self.borrowed.append(driver)
+        yield driver
+
+    def invalidate(self, driver):
+        self.invalidated.append(driver)
+
+    def get_stats(self):
+        return {}
+
+
+def _make_service(pool, retry_times=3, max_ping_failures=2):
+    """跳过 __init__（不读取配置、不创建全局浏览器池），只设置被测方法用到的属性"""
+    service = BalanceMonitorService.__new__(BalanceMonitorService)
+    service.logger = logging.getLogger(__name__)
+    service.browser_pool = pool
+    service.browser_config = {}
+    service._retry_times = retry_times
+    service._max_ping_failures = max_ping_failures
+    return service
+
+
+@pytest.fixture
+def fake_login(monkeypatch):
+    """替换 AuthManager/BrowserManager，登录结果按 driver 名称查表；返回记录的退避时长"""
+    outcomes = {}
+    sleeps = []
+
+    class FakeAuthManager:
+        def __init__(self, browser_mgr):
+            self.driver = browser_mgr.driver
+
+        def login(self, username, password, retry_times=1):
+            success = outcomes.get(self.driver.name, False)
+            return SimpleNamespace(success=success, message="" if success else "密码错误")
+
+    monkeypatch.setattr(monitor_service, "AuthManager", FakeAuthManager)
+    monkeypatch.setattr(monitor_service, "BrowserManager", lambda config: SimpleNamespace(driver=None))
+    # 退避取上限值，便于断言指数增长；sleep 只记录不等待
+    monkeypatch.setattr(monitor_service.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(monitor_service.time, "sleep", sleeps.append)
+    return SimpleNamespace(outcomes=outcomes, sleeps=sleeps)
+
+
+def _login(service):
+    with service._logged_in_session(Account("alice", "pw")) as auth:
+        return auth.driver.name
+
+
+def test_dead_driver_is_invalidated_and_retried_without_backoff(fake_login):
+    """失效实例被标记后立即重新获取，不计入登录重试、也不退避"""
+    pool = FakePool([FakeDriver("dead", alive=False), FakeDriver("ok")])
+    fake_login.outcomes["ok"] = True
+
+    assert _login(_make_service(pool)) == "ok"
+    assert [d.name for d in pool.invalidated] == ["dead"]
+    assert fake_login.sleeps == []
+
+
+def test_consecutive_ping_failures_abort(fake_login):
+    """连续探活失败达到上限时放弃"""
+    pool = FakePool([FakeDriver("dead1", alive=False), FakeDriver("dead2", alive=False)])
+
+    with pytest.raises(Exception, match="连续 2 次探活失败"):
+        _login(_make_service(pool, max_ping_failures=2))
+
+
+def test_successful_ping_resets_ping_failure_count(fake_login):
+    """中间有一次探活成功时，之后的失效不与之前的累计为“连续”失败"""
+    pool = FakePool([
+        FakeDriver("dead1", alive=False),
+        FakeDriver("alive_login_fails"),
+        FakeDriver("dead2", alive=False),
+        FakeDriver("ok"),
+    ])
+    fake_login.outcomes["ok"] = True
+
+    assert _login(_make_service(pool, max_ping_failures=2)) == "ok"
+    assert len(pool.invalidated) == 2
+
+
+def test_login_failures_back_off_exponentially_then_raise(fake_login):
+    """登录失败按指数退避重试，重试用尽后抛出最后一次失败原因"""
+    pool = FakePool([FakeDriver("a"), FakeDriver("b"), FakeDriver("c")])
+
+    with pytest.raises(Exception, match="已重试3次: 密码错误"):
+        _login(_make_service(pool, retry_times=3))
+
+    base = BalanceMonitorService.LOGIN_BACKOFF_BASE
+    assert fake_login.sleeps == [base, base * 2]
+    assert pool.drivers == []
+
+
+def _make_scan_service(check, timeout=90, max_workers=4):
+    """构造只用于批量查询的服务，check_single_account 替换为 check"""
+    service = _make_service(FakePool([]))
+    service.perf_monitor = monitor_service.get_performance_monitor()
+    service.max_workers = max_workers
+    service._timeout = timeout
+    service.check_single_account = check
+    return service
+
+
+def _accounts(*names):
+    return [Account(name, "pw") for name in names]
+
+
+def test_scan_calls_on_poll_in_caller_thread_and_collects_results():
+    caller = threading.get_ident()
+    poll_threads = []
+
+    def check(account):
+        time.sleep(0.3)
+        return account.username, "1.00", True
+
+    service = _make_scan_service(check)
+    results = service.check_all_accounts(
+        _accounts("a", "b"), on_poll=lambda: poll_threads.append(threading.get_ident())
+    )
+
+    assert sorted(results) == [("a", "1.00", True), ("b", "1.00", True)]
+    assert poll_threads and set(poll_threads) == {caller}
+
+
+def test_scan_cancel_returns_early_and_drops_unstarted_accounts():
+    """取消后不等待进行中的账号，尚未开始的账号不再执行"""
+    release = threading.Event()
+    started = []
+
+    def check(account):
+        started.append(account.username)
+        release.wait(5)
+        return account.username, "1.00", True
+
+    cancel = threading.Event()
+    service = _make_scan_service(check, max_workers=1)
+    timer = threading.Timer(0.3, cancel.set)
+    timer.start()
+    begin = time.monotonic()
+    try:
+        results = service.check_all_accounts(_accounts("a", "b", "c"), cancel_event=cancel)
+        elapsed = time.monotonic() - begin
+    finally:
+        release.set()
+        timer.cancel()
+
+    assert results == []
+    assert elapsed < 2
+    time.sleep(0.1)
+    assert started == ["a"]
+
+
+def test_scan_stall_timeout_marks_remaining_accounts():
+    """连续 _timeout 秒无账号完成时，剩余账号按超时结果返回"""
+    release = threading.Event()
+
+    def check(account):
+        if account.username == "hang":
+            release.wait(5)
+        return account.username, "1.00", True
+
+    service = _make_scan_service(check, timeout=0.5)
+    begin = time.monotonic()
+    try:
+        results = service.check_all_accounts(_accounts("ok", "hang"))
+        elapsed = time.monotonic() - begin
+    finally:
+        release.set()
+
+    assert sorted(results) == [("hang", "超时", False), ("ok", "1.00", True)]
+    assert elapsed < 2
+
+
+def test_stop_all_periodic_checks_cancels_running_scan():
+    """退出时停止定期检查会取消进行中的一轮，而不是等到 join 超时"""
+    scanning = threading.Event()
+    service = _make_service(FakePool([]))
+    service._stop = threading.Event()
+    service.check_thread = None
+    service._query_interval = 0  # 无效间隔回退为默认值，不应除零
+
+    def check_all_accounts(cancel_event=None):
+        scanning.set()
+        cancel_event.wait(5)
+
+    service.check_all_accounts = check_all_accounts
+    service.start_periodic_check()
+    assert scanning.wait(2)
+
+    begin = time.monotonic()
+    monitor_service.stop_all_periodic_checks(timeout=3)
+
+    assert time.monotonic() - begin < 1
+    assert service.check_thread is None
+    assert service not in monitor_service._periodic_services
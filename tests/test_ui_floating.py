@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""ui_floating 模块测试（无显示环境时使用 offscreen 平台）"""
+
+import json
+import logging
+import os
+import threading
+import time
+from functools import partial
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt6")
+
+from src import ui_floating  # noqa: E402
+from src.ui_floating import FloatingMonitor, MonitorWorker  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """整个模块共用一个 QApplication（须保持引用，否则被回收后无法创建控件）"""
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def _make_monitor_stub(wsl_targets=None):
+    """构造仅包含 _resolve_codex_auth_path 所需属性的替身对象"""
+    return SimpleNamespace(
+        logger=logging.getLogger(__name__),
+        _discover_wsl_codex_targets=lambda use_cache=True: list(wsl_targets or []),
+    )
+
+
+def test_resolve_codex_auth_path_without_candidates_uses_default():
+    """没有任何候选路径时回退到默认路径，且不抛异常"""
+    monitor = _make_monitor_stub()
+
+    with mock.patch.object(ui_floating, "_unique_paths", return_value=[]):
+        path, local_paths, wsl_targets = FloatingMonitor._resolve_codex_auth_path(monitor)
+
+    assert path == ui_floating._DEFAULT_CODEX_AUTH_PATH
+    assert local_paths == [ui_floating._DEFAULT_CODEX_AUTH_PATH]
+    assert wsl_targets == []
+
+
+def test_resolve_codex_auth_path_prefers_existing_file(tmp_path, monkeypatch):
+    """环境变量指定的路径存在时优先使用"""
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    monkeypatch.setenv("CODEX_AUTH_PATH", str(auth_file))
+    monitor = _make_monitor_stub()
+
+    path, local_paths, _ = FloatingMonitor._resolve_codex_auth_path(monitor)
+
+    assert path == auth_file
+    assert local_paths[0] == auth_file
+
+
+def test_external_config_loaded_skips_fields_changed_during_load():
+    """后台加载期间用户已修改的Token不被加载结果覆盖，未修改的字段正常更新"""
+    monitor = SimpleNamespace(
+        _token_generation=1,
+        _openai_key_generation=0,
+        current_env_token="user-token",
+        current_openai_key="",
+        codex_auth_path=None,
+        local_codex_paths=[],
+        wsl_targets=[],
+        _config_loader=object(),
+        _external_config_loaded=False,
+        refresh_user_display=lambda: None,
+        update_env_status_display=lambda: None,
+    )
+    auth_path = ui_floating._DEFAULT_CODEX_AUTH_PATH
+
+    FloatingMonitor._on_external_config_loaded(monitor, {
+        "codex_auth_path": auth_path,
+        "local_codex_paths": [auth_path],
+        "wsl_targets": [],
+        "current_env_token": "stale-token",
+        "current_openai_key": "loaded-key",
+        "token_generation": 0,
+        "openai_key_generation": 0,
+    })
+
+    assert monitor.current_env_token == "user-token"
+    assert monitor.current_openai_key == "loaded-key"
+    assert monitor.local_codex_paths == [auth_path]
+    assert monitor._external_config_loaded
+
+
+class _FakeService:
+    """按线程池方式回调结果的查询服务替身"""
+
+    on_balance_update = None
+
+    def __init__(self, usernames):
+        self.usernames = usernames
+
+    def check_all_accounts(self, max_workers=None, cancel_event=None, on_poll=None):
+        callback = self.on_balance_update
+        threads = [
+            threading.Thread(target=callback, args=(name, "1.00", True))
+            for name in self.usernames
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        on_poll()
+
+
+def test_monitor_worker_delivers_all_results_before_finished(qapp):
+    """工作线程攒批的结果全部在 finished 之前送达UI线程的槽函数"""
+    usernames = ["user%d" % i for i in range(20)]
+    worker = MonitorWorker(_FakeService(usernames))
+    events = []
+    worker.results_batch.connect(lambda run_id, items: events.append((run_id, items)))
+    worker.finished.connect(lambda: events.append("finished"))
+
+    worker.restart()
+    deadline = time.monotonic() + 5
+    while "finished" not in events and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    worker.wait(1000)
+
+    assert events[-1] == "finished"
+    delivered = [item[0] for run_id, items in events[:-1] for item in items]
+    assert sorted(delivered) == sorted(usernames)
+    assert all(run_id == worker.run_id for run_id, _ in events[:-1])
+
+
+def _make_display_stub(accounts, env_token="", openai_key=""):
+    """构造刷新用户列所需属性的替身对象，表格使用真实的 QTableWidget（调用方须先创建 qapp）"""
+    from PyQt6.QtWidgets import QTableWidget
+
+    monitor = SimpleNamespace(
+        config=SimpleNamespace(accounts=accounts),
+        current_env_token=env_token,
+        current_openai_key=openai_key,
+        table=QTableWidget(len(accounts), 3),
+        _name_items=[],
+        _row_display_names=[],
+        _marked_pair=None,
+        _indexed_usernames=(),
+        _key_to_rows={},
+    )
+    monitor._rebuild_account_index = partial(FloatingMonitor._rebuild_account_index, monitor)
+    monitor._current_display_names = partial(FloatingMonitor._current_display_names, monitor)
+    return monitor
+
+
+def _column_texts(table):
+    return [table.item(i, 0).text() for i in range(table.rowCount())]
+
+
+def test_refresh_user_display_rebuilds_when_accounts_change_with_same_count(qapp):
+    """账号替换但数量不变时，显示名称按新账号重建而不是沿用旧缓存"""
+    from src.config_manager import Account
+
+    monitor = _make_display_stub(
+        [Account("alice", "p", "k1"), Account("bob", "p", "k2")], env_token="k1"
+    )
+    FloatingMonitor.refresh_user_display(monitor)
+    assert _column_texts(monitor.table) == ["● alice", "bob"]
+
+    monitor.config.accounts = [Account("carol", "p", "k2"), Account("dave", "p", "k3")]
+    monitor.current_openai_key = "k3"
+    FloatingMonitor.refresh_user_display(monitor)
+
+    assert _column_texts(monitor.table) == ["carol", "◎ dave"]
+
+
+@pytest.mark.parametrize("data, expected", [
+    ("Ubuntu\r\nDebian\r\n".encode("utf-16-le"), "Ubuntu\r\nDebian\r\n"),
+    (b"\xff\xfe" + "Ubuntu".encode("utf-16-le"), "Ubuntu"),
+    (b"/home/user\n", "/home/user\n"),
+    ("/home/用户\n".encode("utf-8"), "/home/用户\n"),
+    (b"", ""),
+])
+def test_decode_wsl_output(data, expected):
+    """无BOM的UTF-16LE（内容为ASCII）也按UTF-16解码，不被当作含NUL的ASCII"""
+    assert FloatingMonitor._decode_wsl_output(None, data) == expected
+
+
+def _make_json_cache_stub():
+    monitor = SimpleNamespace(_settings_cache={}, _settings_cache_lock=threading.Lock())
+    monitor._read_json_cached = partial(FloatingMonitor._read_json_cached, monitor)
+    return monitor
+
+
+def test_json_cache_reuses_parse_until_file_changes(tmp_path):
+    """文件未修改时返回缓存的解析结果，mtime/大小变化后重新解析"""
+    path = tmp_path / "settings.json"
+    path.write_text('{"env": {"ANTHROPIC_AUTH_TOKEN": "a"}}', encoding="utf-8")
+    monitor = _make_json_cache_stub()
+
+    first = monitor._read_json_cached(path)
+    assert monitor._read_json_cached(path) is first
+
+    path.write_text('{"env": {"ANTHROPIC_AUTH_TOKEN": "bb"}}', encoding="utf-8")
+    assert monitor._read_json_cached(path)["env"]["ANTHROPIC_AUTH_TOKEN"] == "bb"
+
+
+def test_write_json_atomic_replaces_file_and_primes_cache(tmp_path):
+    path = tmp_path / "auth.json"
+    path.write_text('{"OPENAI_API_KEY": "old"}', encoding="utf-8")
+    monitor = _make_json_cache_stub()
+    settings = {"OPENAI_API_KEY": "new"}
+
+    FloatingMonitor._write_json_atomic(monitor, path, settings)
+
+    assert json.loads(path.read_text(encoding="utf-8")) == settings
+    assert monitor._read_json_cached(path) is settings
+    assert [p.name for p in tmp_path.iterdir()] == ["auth.json"]